@@ -1,43 +1,55 @@
 import streamlit as st
 import pandas as pd
 
+from insight_bench import cache, diagnostics, recording, stats, widgets
+from insight_bench.pipeline import ENCODINGS
+
 st.set_page_config(page_title="Home", page_icon="✨", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
-if 'data' not in st.session_state:
-    @st.cache_data
-    def load_spotify_sample():
-        try:
-            encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    st.session_state['data'] = pd.read_csv('spotify_songs.csv', encoding=encoding)
-                    return pd.read_csv('spotify_songs.csv', encoding=encoding)
-                except UnicodeDecodeError:
-                    continue
-            st.error("Could not read file with any supported encoding")
-            return None
-        except Exception as e:
-            st.error(f"Error loading sample dataset: {str(e)}")
-            return None
+def parse_csv(source, source_key, encoding):
+    """Parse a CSV, reopening it from the on-disk cache if it was parsed before."""
+    data_key = cache.derive_key(source_key, encoding)
+    if st.session_state.get('data_key') == data_key and st.session_state.get('data') is not None:
+        return st.session_state['data']
 
-if 'data' not in st.session_state:
-    st.session_state['data'] = load_spotify_sample()
-    st.success("Loaded Spotify dataset. Choose your own file to upload or use this data instead.")
+    df = cache.load_dataset(data_key)
+    if df is None:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        with diagnostics.measure("home.read_csv", encoding=encoding):
+            df = pd.read_csv(source, encoding=encoding)
+        df = cache.share_dataset(data_key, df)
+    st.session_state['data_key'] = data_key
+    recording.reset()
+    return df
+
+def load_spotify_sample():
+    try:
+        source_key = cache.content_hash('spotify_songs.csv')
+        for encoding in ENCODINGS:
+            try:
+                return parse_csv('spotify_songs.csv', source_key, encoding)
+            except UnicodeDecodeError:
+                continue
+        st.error("Could not read file with any supported encoding")
+        return None
+    except Exception as e:
+        st.error(f"Error loading sample dataset: {str(e)}")
+        return None
 
-@st.cache_data
 def read_csv(file, encoding='utf-8'):
+    source_key = cache.content_hash(file.getvalue())
     try:
-        st.session_state['data'] = pd.read_csv(file, encoding=encoding)
-        return pd.read_csv(file, encoding=encoding)
+        return parse_csv(file, source_key, encoding)
     except UnicodeDecodeError:
-        encodings = ['latin1', 'iso-8859-1', 'cp1252']
-        for enc in encodings:
+        st.error(f"Error with selected encoding. Trying alternative encodings...")
+        for enc in ENCODINGS:
+            if enc == encoding:
+                continue
             try:
-                st.session_state['data'] = pd.read_csv(file, encoding=enc)
-                return pd.read_csv(file, encoding=enc)
+                return parse_csv(file, source_key, enc)
             except UnicodeDecodeError:
                 continue
         st.error("Could not read file with any supported encoding")
@@ -52,6 +64,10 @@ def read_csv(file, encoding='utf-8'):
         st.error(f"An unexpected error occurred while reading the file: {str(e)}")
         return None
 
+if 'data' not in st.session_state:
+    st.session_state['data'] = load_spotify_sample()
+    st.success("Loaded Spotify dataset. Choose your own file to upload or use this data instead.")
+
 st.markdown("<h1 class='custom-header'>Insight Bench</h1>", unsafe_allow_html=True)
 
 uploaded_file = st.file_uploader("Upload your CSV file", type="csv")
@@ -60,17 +76,13 @@ use_sample = st.button("Use Spotify Dataset")
 if uploaded_file is not None:
     encoding = st.selectbox(
         "Select file encoding",
-        ['utf-8', 'latin1', 'iso-8859-1', 'cp1252'],
+        ENCODINGS,
         index=0
         )
 
 df = None or st.session_state['data']
 if uploaded_file is not None:
-    try:
-        df = pd.read_csv(uploaded_file, encoding=encoding)
-    except Exception as e:
-        st.error(f"Error with selected encoding. Trying alternative encodings...")
-        df = read_csv(uploaded_file)
+    df = read_csv(uploaded_file, encoding)
 elif use_sample:
     df = load_spotify_sample()
     if df is not None:
@@ -82,7 +94,7 @@ if df is not None and not df.empty:
     metrics = [
         ("Rows", df.shape[0]),
         ("Columns", df.shape[1]),
-        ("Null Values", df.isnull().sum().sum())
+        ("Null Values", stats.statistic(st.session_state.get('data_key'), df, 'null_counts').sum())
     ]
     for col, (title, value) in zip(cols, metrics):
         with col:
@@ -91,3 +103,5 @@ if df is not None and not df.empty:
                 unsafe_allow_html=True
             )
     st.session_state['data'] = df
+
+widgets.diagnostics_panel()
@@ -0,0 +1 @@
+"""Performance benchmarks for the computations behind each page."""
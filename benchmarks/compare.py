@@ -0,0 +1,47 @@
+"""Compare two benchmark result files.
+
+Usage::
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 1.2
+
+Prints the time and peak memory ratio of every benchmark present in both
+files and exits with status 1 if any benchmark got slower than
+``--threshold`` times the baseline.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report['meta'], {(r['dataset'], r['benchmark']): r for r in report['results']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="time ratio above which a benchmark counts as a regression")
+    args = parser.parse_args(argv)
+
+    base_meta, baseline = _load(args.baseline)
+    cand_meta, candidate = _load(args.candidate)
+    print(f"baseline  {base_meta.get('commit')}  candidate  {cand_meta.get('commit')}")
+    print(f"{'dataset':<24} {'benchmark':<28} {'time':>8} {'memory':>8}")
+
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys()):
+        base, cand = baseline[key], candidate[key]
+        time_ratio = cand['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        memory_ratio = cand['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else float('inf')
+        flag = "  REGRESSION" if time_ratio > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{key[0]:<24} {key[1]:<28} {time_ratio:7.2f}x {memory_ratio:7.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Synthetic datasets for the benchmarks.
+
+``synthetic`` varies rows, columns and string cardinality independently.
+``spotify_like`` mimics the schema of the bundled Spotify songs sample.
+Both inject missing values and duplicate rows so the cleaning paths have
+work to do, and both are deterministic for a given seed.
+"""
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    'small': 10_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+
+
+def _inject_missing_and_duplicates(df, rng, null_fraction, duplicate_fraction):
+    for column in df.columns:
+        mask = rng.random(len(df)) < null_fraction
+        df.loc[mask, column] = None
+    n_duplicates = int(len(df) * duplicate_fraction)
+    return pd.concat([df.iloc[:len(df) - n_duplicates], df.iloc[:n_duplicates]], ignore_index=True)
+
+
+def synthetic(rows, numeric_cols=10, string_cols=3, cardinality=50,
+              null_fraction=0.02, duplicate_fraction=0.01, seed=0):
+    """Return a frame of normal floats, a few outliers and low-cardinality strings."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(numeric_cols):
+        values = rng.normal(loc=i, scale=1 + i, size=rows)
+        outliers = rng.random(rows) < 0.001
+        values[outliers] *= 25
+        data[f"num_{i}"] = values
+    categories = np.array([f"cat_{j}" for j in range(cardinality)], dtype=object)
+    for i in range(string_cols):
+        data[f"str_{i}"] = categories[rng.integers(0, cardinality, rows)]
+    df = pd.DataFrame(data)
+    return _inject_missing_and_duplicates(df, rng, null_fraction, duplicate_fraction)
+
+
+def spotify_like(rows, seed=0, null_fraction=0.001, duplicate_fraction=0.01):
+    """Return a frame shaped like the Spotify songs dataset."""
+    rng = np.random.default_rng(seed)
+    n_artists = max(rows // 3, 1)
+    n_albums = max(rows // 2, 1)
+    n_playlists = max(rows // 50, 1)
+    genres = np.array(['pop', 'rap', 'rock', 'latin', 'r&b', 'edm'], dtype=object)
+    subgenres = np.array([f"subgenre_{i}" for i in range(24)], dtype=object)
+
+    def ids(prefix, count, size):
+        return np.array([f"{prefix}{i:08x}" for i in range(count)], dtype=object)[rng.integers(0, count, size)]
+
+    df = pd.DataFrame({
+        'track_id': np.array([f"trk{i:019x}" for i in range(rows)], dtype=object),
+        'track_name': ids("Track ", rows, rows),
+        'track_artist': ids("Artist ", n_artists, rows),
+        'track_popularity': rng.integers(0, 101, rows),
+        'track_album_id': ids("alb", n_albums, rows),
+        'track_album_name': ids("Album ", n_albums, rows),
+        'track_album_release_date': pd.to_datetime(
+            rng.integers(0, 20_000, rows), unit='D', origin='1960-01-01'
+        ).strftime('%Y-%m-%d').to_numpy(dtype=object),
+        'playlist_name': ids("Playlist ", n_playlists, rows),
+        'playlist_id': ids("pl", n_playlists, rows),
+        'playlist_genre': genres[rng.integers(0, len(genres), rows)],
+        'playlist_subgenre': subgenres[rng.integers(0, len(subgenres), rows)],
+        'danceability': rng.beta(5, 3, rows),
+        'energy': rng.beta(5, 2, rows),
+        'key': rng.integers(0, 12, rows),
+        'loudness': rng.normal(-6.7, 3, rows),
+        'mode': rng.integers(0, 2, rows),
+        'speechiness': rng.exponential(0.1, rows),
+        'acousticness': rng.beta(1, 4, rows),
+        'instrumentalness': rng.beta(0.2, 3, rows),
+        'liveness': rng.beta(2, 9, rows),
+        'valence': rng.beta(3, 3, rows),
+        'tempo': rng.normal(121, 27, rows),
+        'duration_ms': rng.normal(225_000, 60_000, rows).astype(int),
+    })
+    return _inject_missing_and_duplicates(df, rng, null_fraction, duplicate_fraction)
+
+
+def datasets(scale):
+    """Return the named datasets benchmarked at ``scale``."""
+    rows = SCALES[scale]
+    return {
+        f"narrow-{scale}": synthetic(rows, numeric_cols=5, string_cols=2, cardinality=10),
+        f"wide-{scale}": synthetic(rows // 10, numeric_cols=100, string_cols=10, cardinality=50),
+        f"high-cardinality-{scale}": synthetic(rows, numeric_cols=5, string_cols=5, cardinality=rows // 10),
+        f"spotify-{scale}": spotify_like(rows),
+    }
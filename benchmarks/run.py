@@ -0,0 +1,191 @@
+"""Time and memory-profile the core computation behind each page.
+
+Run from the repository root::
+
+    python -m benchmarks.run --scale small --output results.json
+
+Each benchmark is timed ``--repeat`` times and then run once more under
+``tracemalloc`` to record its peak Python/numpy allocation. Results are
+written as JSON together with the commit and library versions, so two runs
+can be compared with ``python -m benchmarks.compare``.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datasets import SCALES, datasets
+from insight_bench import cache, export, pipeline, stats
+from insight_bench.cleaning import DataQualityChecker
+from insight_bench.features import (
+    get_correlation_importance, get_lasso_feature_importance, get_tree_feature_importance
+)
+from insight_bench.outliers import (
+    detect_outliers_iqr, detect_outliers_mad, detect_outliers_zscore, remove_outliers
+)
+from insight_bench.profiling import categorical_columns, column_profile, distribution_columns
+from insight_bench.splitting import split_data
+
+
+def _numeric(df):
+    return df.select_dtypes(include=[np.number])
+
+
+def _fill_strategies(df):
+    return {
+        column: 'Mean' if pd.api.types.is_numeric_dtype(df[column]) else 'Mode'
+        for column in df.columns[df.isnull().any()]
+    }
+
+
+def _features(df):
+    numeric = _numeric(df).fillna(0)
+    return numeric.iloc[:, 1:], numeric.iloc[:, 0]
+
+
+def _full_stats(df):
+    """Compute every statistic the pages read from ``insight_bench.stats``."""
+    dataset_stats = stats.DatasetStats(df)
+    dataset_stats.null_counts(df)
+    dataset_stats.corr(df)
+    for column in df.columns:
+        dataset_stats.counts(df, column)
+        if pd.api.types.is_numeric_dtype(df[column]):
+            dataset_stats.mean(df, column)
+            dataset_stats.minimum(df, column)
+            dataset_stats.maximum(df, column)
+    return dataset_stats
+
+
+def benchmarks(df, workdir):
+    """Return (name, setup) pairs; ``setup()`` returns the callable to time."""
+    csv_path = os.path.join(workdir, "data.csv")
+    first_numeric = _numeric(df).columns[0]
+
+    def read_csv():
+        if not os.path.exists(csv_path):
+            df.to_csv(csv_path, index=False)
+        return lambda: pd.read_csv(csv_path)
+
+    def cache_load():
+        cache.store_dataset("bench", df)
+        return lambda: cache.load_dataset("bench")
+
+    def stats_update():
+        parent = _full_stats(df)
+        after = remove_outliers(df, first_numeric, "IQR")
+        removed = df[~df.index.isin(after.index)]
+        return lambda: parent.updated(after, removed, df.iloc[:0], df.iloc[:0])
+
+    def replay():
+        read_csv()
+        steps = [
+            {'op': 'remove_duplicates', 'subset': None, 'keep': 'first'},
+            {'op': 'fill_missing', 'values': {first_numeric: 0.0}},
+            {'op': 'filter_range', 'column': first_numeric, 'lower': -100.0, 'upper': 100.0},
+        ]
+        return lambda: pipeline.stream(csv_path, steps, os.path.join(workdir, "replay.csv"))
+
+    return [
+        ("home.read_csv", read_csv),
+        ("home.cache_load", cache_load),
+        ("column_information.profile", lambda: lambda: [column_profile(df[c]) for c in df.columns]),
+        ("correlation.corr", lambda: lambda: _numeric(df).corr()),
+        ("distribution.columns", lambda: lambda: distribution_columns(df)),
+        ("categorical.columns", lambda: lambda: categorical_columns(df)),
+        ("cleaning.duplicates", lambda: lambda: DataQualityChecker(df).get_duplicate_info()),
+        ("cleaning.missing_info", lambda: lambda: DataQualityChecker(df).get_missing_info()),
+        ("cleaning.impute", lambda: lambda: DataQualityChecker(df).handle_missing_values(_fill_strategies(df))),
+        ("outliers.zscore", lambda: lambda: detect_outliers_zscore(df, first_numeric)),
+        ("outliers.iqr", lambda: lambda: detect_outliers_iqr(df, first_numeric)),
+        ("outliers.mad", lambda: lambda: detect_outliers_mad(df, first_numeric)),
+        ("outliers.remove", lambda: lambda: remove_outliers(df, first_numeric, "IQR")),
+        ("features.correlation", lambda: lambda: get_correlation_importance(*_features(df))),
+        ("features.lasso", lambda: lambda: get_lasso_feature_importance(*_features(df))),
+        ("features.tree", lambda: lambda: get_tree_feature_importance(*_features(df))),
+        ("stats.full", lambda: lambda: _full_stats(df)),
+        ("stats.update", stats_update),
+        ("split.train_test", lambda: lambda: split_data(df, 0.2, 42, 0.15)),
+        ("export.write_csv", lambda: lambda: export.write_csv(df, os.path.join(workdir, "export.csv"))),
+        ("export.write_csv_gzip", lambda: lambda: export.write_csv(df, os.path.join(workdir, "export.csv.gz"), 'gzip')),
+        ("pipeline.stream", replay),
+    ]
+
+
+def measure(fn, repeat):
+    """Return the best and mean wall time over ``repeat`` runs and the peak allocation."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(timings), 'mean_seconds': sum(timings) / len(timings), 'peak_bytes': peak}
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the computations behind each page.")
+    parser.add_argument("--scale", choices=SCALES, action="append",
+                        help="dataset scale, may be repeated (default: small)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--only", action="append", default=[],
+                        help="run only benchmarks whose name contains this text, may be repeated")
+    parser.add_argument("--skip", action="append", default=[],
+                        help="skip benchmarks whose name contains this text, may be repeated")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        cache.CACHE_DIR = os.path.join(workdir, "cache")
+        for scale in args.scale or ['small']:
+            for dataset, df in datasets(scale).items():
+                dataset_dir = os.path.join(workdir, dataset)
+                os.makedirs(dataset_dir)
+                for name, setup in benchmarks(df, dataset_dir):
+                    if args.only and not any(text in name for text in args.only):
+                        continue
+                    if any(text in name for text in args.skip):
+                        continue
+                    result = measure(setup(), args.repeat)
+                    result.update({'dataset': dataset, 'rows': len(df), 'columns': df.shape[1], 'benchmark': name})
+                    results.append(result)
+                    print(f"{dataset:<24} {name:<28} {result['seconds']:9.4f}s "
+                          f"{result['peak_bytes'] / 2**20:10.1f} MiB", flush=True)
+
+    with open(args.output, "w") as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
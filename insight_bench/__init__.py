@@ -0,0 +1 @@
+"""Shared helpers used by the Insight Bench Streamlit pages."""
@@ -0,0 +1,5 @@
+import sys
+
+from insight_bench.cli import main
+
+sys.exit(main())
@@ -0,0 +1,271 @@
+"""On-disk cache of parsed datasets and derived artifacts.
+
+Parsed datasets are stored as uncompressed Arrow IPC (Feather v2) files keyed
+by a content hash, so a warm restart memory-maps them back instead of parsing
+the CSV again. Derived artifacts such as column profiles, correlation matrices
+and feature importances are pickled next to them. The directory is kept under
+``CACHE_MAX_BYTES`` by evicting the least recently used files. Writes keep a
+running total of the bytes stored, so the directory is only scanned once
+that total passes the limit, or every ``EVICT_EVERY`` writes to pick up
+files written by other processes.
+
+The directory can be shared by several Streamlit processes on one machine
+that run as the same user (point ``INSIGHT_BENCH_CACHE_DIR`` at the same
+path). Artifacts are pickles, so the directory must be private: it is
+created with mode 0700, and a directory owned by another user or writable by
+others is refused.
+Loaded datasets are read-only views onto the memory-mapped files, so every
+process maps the same physical pages instead of holding a private copy.
+Operations that change a dataset never write to an existing file; they
+publish the result as a new file under a derived key (copy-on-write).
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import pyarrow.feather as feather
+
+from insight_bench import diagnostics
+
+CACHE_DIR = os.environ.get(
+    "INSIGHT_BENCH_CACHE_DIR", os.path.join(".cache", "insight_bench")
+)
+CACHE_MAX_BYTES = int(os.environ.get("INSIGHT_BENCH_CACHE_MAX_BYTES", 5 * 1024 ** 3))
+EVICT_EVERY = 100
+
+_CHUNK_SIZE = 1 << 20
+_usage_lock = threading.Lock()
+_usage = {'bytes': None, 'writes': 0}
+
+
+def content_hash(source):
+    """Return a hex digest of the contents of a path, file-like object or bytes."""
+    digest = hashlib.blake2b(digest_size=20)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    else:
+        position = source.tell()
+        source.seek(0)
+        for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def derive_key(parent, *parts):
+    """Return the key of data derived from ``parent`` by the operation in ``parts``.
+
+    Data derived from an untracked dataset (``parent`` is None) stays untracked.
+    """
+    if parent is None:
+        return None
+    digest = hashlib.blake2b(str(parent).encode(), digest_size=20)
+    for part in parts:
+        digest.update(b"\0" + repr(part).encode())
+    return digest.hexdigest()
+
+
+_verified_dirs = set()
+
+
+def _check_private(path):
+    """Raise PermissionError unless ``path`` is owned by us and not writable by others."""
+    if not hasattr(os, "getuid"):
+        return
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise PermissionError(
+            f"Refusing to use cache directory {path}: it must be owned by this user and "
+            f"writable by nobody else (chmod 700), because cached artifacts are unpickled."
+        )
+
+
+def _path(kind, name):
+    if CACHE_DIR not in _verified_dirs:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        _check_private(CACHE_DIR)
+        _verified_dirs.add(CACHE_DIR)
+    directory = os.path.join(CACHE_DIR, kind)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+def _dataset_path(key):
+    return _path("datasets", f"{key}.arrow")
+
+
+def _artifact_path(key, name):
+    name_hash = hashlib.blake2b(name.encode(), digest_size=8).hexdigest()
+    return _path("artifacts", f"{key}-{name_hash}.pkl")
+
+
+def _write_atomic(path, write):
+    """Write through a temporary file so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _account(path):
+    """Add a newly written file to the running total and evict when due."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    with _usage_lock:
+        _usage['writes'] += 1
+        if _usage['bytes'] is not None:
+            _usage['bytes'] += size
+        due = (_usage['bytes'] is None or _usage['bytes'] > CACHE_MAX_BYTES
+               or _usage['writes'] >= EVICT_EVERY)
+    if due:
+        evict()
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+@diagnostics.timed("cache.load_dataset")
+def load_dataset(key):
+    """Memory-map a cached dataset, or return None if it is not cached.
+
+    Null-free numeric and boolean columns are zero-copy, read-only views onto
+    the mapped file; other columns are materialised by Arrow as usual.
+    """
+    path = _dataset_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, ValueError):
+        return None
+    _touch(path)
+    return table.to_pandas(split_blocks=True)
+
+
+@diagnostics.timed("cache.store_dataset")
+def store_dataset(key, df):
+    """Cache a dataset, returning False if it cannot be represented in Arrow."""
+    path = _dataset_path(key)
+    try:
+        _write_atomic(path, lambda tmp: feather.write_feather(df, tmp, compression="uncompressed"))
+    except (TypeError, ValueError):
+        return False
+    _account(path)
+    return True
+
+
+def share_dataset(key, df):
+    """Publish ``df`` under ``key`` and return a memory-mapped view of it.
+
+    Falls back to returning ``df`` itself when the dataset is untracked or
+    cannot be written to the cache.
+    """
+    return cached_dataset(key, lambda: df)
+
+
+def cached_dataset(key, compute):
+    """Return a memory-mapped view of dataset ``key``, computing it on a miss.
+
+    Falls back to the computed DataFrame when ``key`` is None or the result
+    cannot be written to the cache.
+    """
+    if key is None:
+        return compute()
+    shared = load_dataset(key)
+    if shared is None:
+        df = compute()
+        shared = load_dataset(key) if store_dataset(key, df) else None
+        if shared is None:
+            return df
+    return shared
+
+
+def load_artifact(key, name):
+    """Return a cached artifact, or None if it is not cached.
+
+    An artifact that cannot be unpickled, for instance because it was written
+    by an older version of the code, is treated as a miss.
+    """
+    path = _artifact_path(key, name)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except Exception:
+        return None
+    _touch(path)
+    return value
+
+
+def store_artifact(key, name, value):
+    """Cache an artifact computed from the dataset identified by ``key``."""
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    path = _artifact_path(key, name)
+    _write_atomic(path, write)
+    _account(path)
+
+
+def cached_artifact(key, name, compute):
+    """Return the artifact ``name`` of dataset ``key``, computing it on a miss.
+
+    A ``key`` of None means the dataset is not tracked by the cache, in which
+    case ``compute`` is always called.
+    """
+    if key is None:
+        return compute()
+    value = load_artifact(key, name)
+    if value is None:
+        value = compute()
+        store_artifact(key, name, value)
+    return value
+
+
+def evict(max_bytes=None):
+    """Delete least recently used files until the cache fits in ``max_bytes``."""
+    if max_bytes is None:
+        max_bytes = CACHE_MAX_BYTES
+    entries = []
+    for kind in ("datasets", "artifacts"):
+        directory = os.path.join(CACHE_DIR, kind)
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+    with _usage_lock:
+        _usage['bytes'] = total
+        _usage['writes'] = 0
@@ -0,0 +1,109 @@
+"""Duplicate and missing value handling behind the Data Cleaning page.
+
+Every operation applied through ``DataQualityChecker`` is also recorded in
+``steps`` as a fitted pipeline step (see ``insight_bench.pipeline``), so the
+same cleanup can be replayed on new data without refitting. The index
+labels of the rows it removed or modified are collected in ``removed`` and
+``modified`` so cached statistics can be updated rather than recomputed
+(see ``insight_bench.stats``).
+"""
+import pandas as pd
+
+from insight_bench import diagnostics
+
+
+def _plain(value):
+    """Convert numpy scalars to built-in types so fitted steps serialize to JSON."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+class DataQualityChecker:
+    def __init__(self, data):
+        # Every operation returns a new frame, so the (possibly shared,
+        # read-only) input never needs a private copy.
+        self.data = data
+        self.original_shape = data.shape
+        self.steps = []
+        self.removed = data.index[:0]
+        self.modified = data.index[:0]
+        
+    @diagnostics.timed("cleaning.duplicate_info")
+    def get_duplicate_info(self):
+        """Get information about duplicate rows."""
+        duplicates = self.data.duplicated(keep='first')
+        duplicate_rows = self.data[duplicates]
+        return {
+            'total_duplicates': len(duplicate_rows),
+            'duplicate_rows': duplicate_rows,
+            'duplicate_indices': duplicates
+        }
+    
+    @diagnostics.timed("cleaning.remove_duplicates")
+    def remove_duplicates(self, subset=None, keep='first'):
+        """Remove duplicate rows; ``keep='none'`` removes every copy."""
+        if keep == 'none':
+            keep = False
+        duplicates = self.data.duplicated(subset=subset, keep=keep)
+        self.removed = self.removed.append(self.data.index[duplicates])
+        self.data = self.data[~duplicates]
+        self.steps.append({
+            'op': 'remove_duplicates',
+            'subset': subset,
+            'keep': 'none' if keep is False else keep
+        })
+        return self.data
+    
+    @diagnostics.timed("cleaning.missing_info")
+    def get_missing_info(self, missing_count=None):
+        """Get information about missing values.
+
+        ``missing_count`` may pass in per-column null counts that are already
+        known, to skip scanning the data for them.
+        """
+        if missing_count is None:
+            missing_count = self.data.isnull().sum()
+        missing_percent = (missing_count / len(self.data)) * 100
+        missing_info = pd.DataFrame({
+            'Missing Count': missing_count,
+            'Missing Percentage': missing_percent
+        })
+        return missing_info[missing_info['Missing Count'] > 0]
+    
+    @diagnostics.timed("cleaning.handle_missing_values")
+    def handle_missing_values(self, strategy_dict, job=None):
+        """Handle missing values according to specified strategies."""
+        df = self.data.copy()
+        
+        for i, (column, strategy) in enumerate(strategy_dict.items()):
+            if job is not None:
+                job.check_cancelled()
+                job.report(i / len(strategy_dict), f"{column}: {strategy}")
+            fill_value = None
+            missing = df[column].isna()
+            if strategy == 'Drop rows':
+                self.removed = self.removed.append(df.index[missing])
+                df = df[~missing]
+                self.steps.append({'op': 'drop_missing', 'columns': [column]})
+            elif strategy == 'Mean':
+                fill_value = df[column].mean()
+            elif strategy == 'Median':
+                fill_value = df[column].median()
+            elif strategy == 'Mode':
+                fill_value = df[column].mode()[0]
+            elif strategy == 'Forward fill':
+                df[column] = df[column].ffill()
+                self.steps.append({'op': 'forward_fill', 'columns': [column]})
+            elif strategy == 'Backward fill':
+                df[column] = df[column].bfill()
+                self.steps.append({'op': 'backward_fill', 'columns': [column]})
+            elif strategy.startswith('Custom value:'):
+                fill_value = strategy.split(':')[1].strip()
+
+            if strategy != 'Drop rows':
+                self.modified = self.modified.append(df.index[missing])
+            if fill_value is not None:
+                df[column] = df[column].fillna(fill_value)
+                self.steps.append({'op': 'fill_missing', 'values': {column: _plain(fill_value)}})
+        
+        self.data = df
+        return df
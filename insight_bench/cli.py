@@ -0,0 +1,121 @@
+"""Command-line entry point for running pipelines over CSV files.
+
+Usage::
+
+    python -m insight_bench pipeline.json data/ more.csv --output-dir out --workers 8
+
+Each input file (directories are searched for ``*.csv``) is processed in a
+separate worker process and every pipeline output is written as
+``<file stem>_<output>.csv`` in the output directory. Files that share a stem
+are told apart by their parent directories, e.g. ``a_data_cleaned.csv`` and
+``b_data_cleaned.csv`` for ``a/data.csv`` and ``b/data.csv``.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from insight_bench import export, pipeline
+
+
+def expand_inputs(paths):
+    """Return the CSV files named by ``paths``, searching directories."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+        else:
+            files.append(path)
+    return files
+
+
+def output_stems(files):
+    """Return the names outputs of each of ``files`` are prefixed with.
+
+    A file's stem is used unless another file has the same one; those are
+    prefixed with their directories below the directory the files share.
+    Raises ValueError if the names still clash, e.g. for a repeated file.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in files]
+    counts = {}
+    for stem in stems:
+        counts[stem] = counts.get(stem, 0) + 1
+    clashing = [path for path, stem in zip(files, stems) if counts[stem] > 1]
+    if clashing:
+        root = os.path.commonpath([os.path.abspath(path) for path in clashing])
+        for i, path in enumerate(files):
+            if counts[stems[i]] > 1:
+                relative = os.path.relpath(os.path.splitext(os.path.abspath(path))[0], root)
+                stems[i] = relative.replace(os.sep, "_")
+
+    seen = {}
+    for path, stem in zip(files, stems):
+        if stem in seen:
+            raise ValueError(f"{seen[stem]} and {path} would write the same outputs")
+        seen[stem] = path
+    return stems
+
+
+def process_file(path, steps, output_dir, compression='none', encoding=None, stem=None):
+    """Run ``steps`` over one file and return the paths written.
+
+    Outputs are named after ``stem``, by default the file's own. Streamable
+    pipelines are replayed chunk by chunk instead of loading the whole file.
+    """
+    if stem is None:
+        stem = os.path.splitext(os.path.basename(path))[0]
+    if pipeline.is_streamable(steps):
+        target = os.path.join(output_dir, export.file_name(f"{stem}_cleaned.csv", compression))
+        pipeline.stream(path, steps, target, compression, encoding)
+        return [target]
+
+    df = pipeline.read_csv(path, encoding)
+    written = []
+    for name, output in pipeline.run(df, steps):
+        target = os.path.join(output_dir, export.file_name(f"{stem}_{name}.csv", compression))
+        export.write_csv(output, target, compression)
+        written.append(target)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m insight_bench",
+        description="Run a cleaning pipeline over CSV files."
+    )
+    parser.add_argument("pipeline", help="JSON file with a 'steps' list")
+    parser.add_argument("inputs", nargs="+", help="CSV files or directories containing them")
+    parser.add_argument("--output-dir", default="output", help="where outputs are written")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--compression", choices=export.COMPRESSIONS, default="none")
+    parser.add_argument("--encoding", default=None, help="input encoding (default: try common encodings)")
+    args = parser.parse_args(argv)
+
+    with open(args.pipeline) as f:
+        steps = json.load(f)["steps"]
+    pipeline.validate(steps)
+    files = expand_inputs(args.inputs)
+    try:
+        stems = output_stems(files)
+    except ValueError as e:
+        parser.error(str(e))
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(process_file, path, steps, args.output_dir, args.compression, args.encoding, stem): path
+            for path, stem in zip(files, stems)
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                written = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"{path}: failed: {e}", file=sys.stderr)
+            else:
+                print(f"{path}: wrote {', '.join(written)}")
+    return 1 if failures else 0
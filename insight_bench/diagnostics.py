@@ -0,0 +1,176 @@
+"""Opt-in timing and memory instrumentation for named operations.
+
+Set ``INSIGHT_BENCH_DIAGNOSTICS=1`` to record the wall time of every
+instrumented operation, or ``INSIGHT_BENCH_DIAGNOSTICS=memory`` to also
+record its peak allocation with ``tracemalloc``, which slows everything down
+noticeably. Records are kept in memory for the sidebar diagnostics panel and
+logged as one JSON object per line to the ``insight_bench.diagnostics``
+logger.
+
+Each record carries the id of the Streamlit session it was made for: the
+session running the script, or the one ``session`` attributes a thread's
+work to, as background jobs do. ``tracemalloc`` has a single process-wide
+peak, so a peak recorded while other threads were busy includes their
+allocations too.
+
+When diagnostics are off, ``timed`` returns the function it decorates
+unchanged and ``measure`` returns a shared no-op context manager, so
+instrumented code pays nothing beyond a function call.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+MODE = os.environ.get("INSIGHT_BENCH_DIAGNOSTICS", "").strip().lower()
+ENABLED = MODE not in ("", "0", "false", "off")
+TRACE_MEMORY = MODE == "memory"
+MAX_RECORDS = int(os.environ.get("INSIGHT_BENCH_DIAGNOSTICS_RECORDS", 200))
+
+logger = logging.getLogger(__name__)
+
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+_disabled = contextlib.nullcontext()
+
+if ENABLED:
+    logger.setLevel(logging.INFO)
+    if not logger.handlers and not logging.getLogger().handlers:
+        _handler = logging.StreamHandler()
+        _handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_handler)
+if TRACE_MEMORY:
+    tracemalloc.start()
+
+
+def _current_session():
+    session = getattr(_local, 'session', None)
+    if session is None and 'streamlit' in sys.modules:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+        session = ctx.session_id if ctx is not None else None
+    return session
+
+
+@contextlib.contextmanager
+def session(session_id):
+    """Attribute the operations this thread records to ``session_id``."""
+    previous = getattr(_local, 'session', None)
+    _local.session = session_id
+    try:
+        yield
+    finally:
+        _local.session = previous
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+class _Measurement:
+    """Time one operation and, if enabled, its peak traced allocation.
+
+    ``tracemalloc`` keeps a single process-wide peak, so a nested measurement
+    hands the peak it saw back to the enclosing one before resetting it.
+    Operations running at the same time on other threads share that peak.
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        if TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+            stack = _stack()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.base = self.peak = current
+            stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        record = {
+            'op': self.name,
+            'seconds': round(seconds, 6),
+            'status': 'ok' if exc_type is None else exc_type.__name__,
+            'thread': threading.current_thread().name,
+            'session': _current_session(),
+            'timestamp': time.time(),
+            **self.fields,
+        }
+        if TRACE_MEMORY:
+            stack = _stack()
+            stack.pop()
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            record['peak_bytes'] = peak - self.base
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+        with _lock:
+            _records.append(record)
+        logger.info(json.dumps(record, default=str))
+        return False
+
+
+def measure(name, **fields):
+    """Return a context manager recording the operation ``name``.
+
+    ``fields`` such as ``rows`` are added to the record as they are.
+    """
+    if not ENABLED:
+        return _disabled
+    return _Measurement(name, fields)
+
+
+def _shape_fields(value):
+    shape = getattr(value, 'shape', None)
+    if not isinstance(shape, tuple) or not shape:
+        return {}
+    fields = {'rows': shape[0]}
+    if len(shape) > 1:
+        fields['columns'] = shape[1]
+    return fields
+
+
+def timed(name):
+    """Decorate a function so each call is recorded as the operation ``name``.
+
+    If the first argument is a DataFrame, Series or array its shape is
+    recorded too.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with measure(name, **_shape_fields(args[0] if args else None)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def records(session=None):
+    """Return the operations recorded for ``session``, or all of them, oldest first."""
+    with _lock:
+        return [record for record in _records if session is None or record['session'] == session]
+
+
+def clear(session=None):
+    """Forget the operations recorded for ``session``, or all of them."""
+    with _lock:
+        kept = [record for record in _records if session is not None and record['session'] != session]
+        _records.clear()
+        _records.extend(kept)
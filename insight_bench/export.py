@@ -0,0 +1,126 @@
+"""Streaming CSV export.
+
+Exports are written one chunk of rows at a time into an optionally compressed
+file, so the CSV text is never held in memory as a whole, and nothing is
+written until a download is requested. Files go to Streamlit's static
+directory and are served from disk (``server.enableStaticServing``) instead
+of being embedded in the page.
+
+Static files are public to anyone who knows their URL, so each session
+exports into its own directory named by an unguessable token. Streamlit
+refuses to serve static files over ``MAX_FILE_BYTES``, so larger exports are
+handed to a download button from disk instead.
+"""
+import gzip
+import io
+import os
+import tempfile
+import uuid
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from insight_bench import diagnostics
+
+EXPORT_DIR = os.path.join("static", "exports")
+EXPORT_URL = "app/static/exports"
+CHUNK_ROWS = 100_000
+MAX_EXPORTS = int(os.environ.get("INSIGHT_BENCH_MAX_EXPORTS", 32))
+# Streamlit's MAX_APP_STATIC_FILE_SIZE; larger static files are answered with 404.
+MAX_FILE_BYTES = 200 * 1024 * 1024
+
+COMPRESSIONS = ['none', 'gzip'] + (['zstd'] if zstandard is not None else [])
+_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+def file_name(filename, compression='none'):
+    """Return the name a download of ``filename`` is saved under."""
+    return filename + _EXTENSIONS[compression]
+
+
+def url_for(path):
+    """Return the URL Streamlit serves an exported file from."""
+    return f"{EXPORT_URL}/{os.path.relpath(path, EXPORT_DIR).replace(os.sep, '/')}"
+
+
+def servable(path):
+    """Return whether Streamlit's static file server will serve ``path``."""
+    return os.path.getsize(path) <= MAX_FILE_BYTES
+
+
+def _open(path, compression):
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=6)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+    return open(path, 'wb')
+
+
+def write_csv_chunks(chunks, path, compression='none'):
+    """Write an iterable of DataFrames to ``path`` as one CSV with a single header."""
+    with io.TextIOWrapper(_open(path, compression), encoding='utf-8', newline='') as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=i == 0)
+
+
+@diagnostics.timed("export.write_csv")
+def write_csv(df, path, compression='none', job=None, chunk_rows=CHUNK_ROWS):
+    """Write ``df`` as CSV to ``path`` one chunk of rows at a time."""
+    def chunks():
+        for start in range(0, max(len(df), 1), chunk_rows):
+            if job is not None:
+                job.check_cancelled()
+                job.report(start / max(len(df), 1), f"{start}/{len(df)} rows")
+            yield df.iloc[start:start + chunk_rows]
+
+    write_csv_chunks(chunks(), path, compression)
+
+
+def export_file(filename, compression, key, write, directory=""):
+    """Create an export by calling ``write(path)`` and return the path of the file.
+
+    The file is placed in ``directory`` under ``EXPORT_DIR``. Exports with the
+    same ``key`` reuse the file already on disk.
+    """
+    export_dir = os.path.join(EXPORT_DIR, directory)
+    os.makedirs(export_dir, exist_ok=True)
+    path = os.path.join(export_dir, f"{key or uuid.uuid4().hex}-{file_name(filename, compression)}")
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+
+    fd, tmp_path = tempfile.mkstemp(dir=export_dir, prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _prune()
+    return path
+
+
+def _prune():
+    """Keep only the ``MAX_EXPORTS`` most recently used exports."""
+    entries = []
+    for root, _, names in os.walk(EXPORT_DIR):
+        for name in names:
+            if name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+    for _, path in sorted(entries, reverse=True)[MAX_EXPORTS:]:
+        try:
+            os.remove(path)
+            directory = os.path.dirname(path)
+            if directory != EXPORT_DIR and not os.listdir(directory):
+                os.rmdir(directory)
+        except OSError:
+            continue
@@ -0,0 +1,66 @@
+"""Feature importance measures behind the Feature Engineering page."""
+import numpy as np
+import pandas as pd
+
+from insight_bench import diagnostics
+
+
+@diagnostics.timed("features.lasso")
+def get_lasso_feature_importance(X, y, alpha=1.0):
+    """Calculate feature importance using Lasso regularization."""
+    from sklearn.linear_model import Lasso
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    
+    model = Lasso(alpha=alpha)
+    model.fit(X_scaled, y)
+    
+    importance = pd.DataFrame({
+        'Feature': X.columns,
+        'Importance': np.abs(model.coef_)
+    })
+    return importance.sort_values('Importance', ascending=False)
+
+
+@diagnostics.timed("features.tree")
+def get_tree_feature_importance(X, y, job=None, n_estimators=100, batch_size=10):
+    """Calculate feature importance using Random Forest.
+
+    Trees are grown in batches with ``warm_start`` so a background job can
+    report progress and stop between batches. The fitted forest is the same
+    as one fitted with all trees at once.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    model = RandomForestRegressor(n_estimators=batch_size, random_state=42, warm_start=True)
+    for n_trees in range(batch_size, n_estimators + 1, batch_size):
+        if job is not None:
+            job.check_cancelled()
+        model.set_params(n_estimators=n_trees)
+        model.fit(X, y)
+        if job is not None:
+            job.report(n_trees / n_estimators, f"{n_trees}/{n_estimators} trees")
+    
+    importance = pd.DataFrame({
+        'Feature': X.columns,
+        'Importance': model.feature_importances_
+    })
+    return importance.sort_values('Importance', ascending=False)
+
+
+@diagnostics.timed("features.correlation")
+def get_correlation_importance(X, y, threshold=0.0):
+    """Calculate feature importance using absolute correlation with target."""
+    df = X.copy()
+    df['target'] = y
+    
+    # Calculate correlations with target
+    correlations = df.corr()['target'].drop('target')
+    
+    importance = pd.DataFrame({
+        'Feature': correlations.index,
+        'Importance': np.abs(correlations.values)
+    })
+    return importance.sort_values('Importance', ascending=False)
@@ -0,0 +1,184 @@
+"""Background jobs for long-running page operations.
+
+Streamlit reruns the page script on every widget interaction, which abandons
+any work done inline. Jobs run on process-wide thread pools instead, so they
+outlive the rerun that started them. Model fits go to the ``'fit'`` pool and
+everything else to the ``'default'`` one, so quick cleaning steps and exports
+never queue behind other sessions' long fits. A job is keyed by its inputs: submitting
+the same key again returns the running or finished job rather than starting
+the work over.
+
+Jobs are shared by every session that submits the same key, so each one
+records its ``owners``. Cancelling on behalf of an owner only detaches that
+owner, and the work stops once nobody is left waiting. The result is held
+until every owner has consumed it, after which the registry keeps only the
+job's key and status; callers that need the result across reruns keep it
+themselves, preferably as a memory-mapped view from ``insight_bench.cache``.
+At most ``MAX_FINISHED_JOBS`` finished jobs are kept.
+
+The job function receives the ``Job`` as its first argument and may call
+``job.report`` to publish progress and ``job.check_cancelled`` at safe points
+to honour cancellation.
+"""
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from insight_bench import diagnostics
+
+MAX_WORKERS = int(os.environ.get("INSIGHT_BENCH_JOB_WORKERS", os.cpu_count() or 2))
+MAX_FIT_WORKERS = int(os.environ.get("INSIGHT_BENCH_FIT_WORKERS", 2))
+MAX_FINISHED_JOBS = int(os.environ.get("INSIGHT_BENCH_MAX_FINISHED_JOBS", 16))
+
+_executors = {
+    'default': ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="insight-bench-job"),
+    'fit': ThreadPoolExecutor(max_workers=MAX_FIT_WORKERS, thread_name_prefix="insight-bench-fit"),
+}
+_jobs = OrderedDict()
+_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when the job has been cancelled."""
+
+
+class Job:
+    def __init__(self, key, name, owner=None):
+        self.key = key
+        self.name = name
+        self.owner = owner
+        self.owners = set() if owner is None else {owner}
+        self.progress = 0.0
+        self.message = ""
+        self.released = False
+        self._result = None
+        self._cancel_requested = threading.Event()
+        self._future = None
+
+    def report(self, progress, message=None):
+        """Publish progress as a fraction between 0 and 1."""
+        self.progress = min(max(float(progress), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel_requested.is_set():
+            raise JobCancelled(self.name)
+
+    def cancel(self, owner=None):
+        """Stop waiting for the job on behalf of ``owner``.
+
+        The job itself is cancelled once no other owner waits on it, or right
+        away if ``owner`` is None. A job that has not started yet never runs.
+        """
+        with _lock:
+            self.owners.discard(owner)
+            if owner is not None and self.owners:
+                return
+        self._cancel_requested.set()
+        self._future.cancel()
+
+    def watched_by(self, owner):
+        """Return whether ``owner`` is still waiting for this job."""
+        return owner is None or owner in self.owners
+
+    def done(self):
+        return self._future.done()
+
+    @property
+    def status(self):
+        """One of 'pending', 'running', 'done', 'failed' or 'cancelled'."""
+        if not self._future.done():
+            return "running" if self._future.running() else "pending"
+        if self._future.cancelled():
+            return "cancelled"
+        error = self._future.exception()
+        if isinstance(error, JobCancelled):
+            return "cancelled"
+        return "failed" if error is not None else "done"
+
+    def exception(self):
+        """Return the error a failed job raised, or None."""
+        if self.status != "failed":
+            return None
+        return self._future.exception()
+
+    def result(self, timeout=None):
+        """Block until the job finishes and return its result.
+
+        Raises LookupError if every owner has already consumed the result.
+        """
+        try:
+            self._future.result(timeout)
+        except CancelledError:
+            raise JobCancelled(self.name) from None
+        if self.released:
+            raise LookupError(f"{self.name} has already been consumed")
+        return self._result
+
+    def consume(self, owner=None):
+        """Return the result on behalf of ``owner`` and stop holding it for them.
+
+        Once no owner is left the result is dropped from the registry.
+        """
+        result = self.result()
+        with _lock:
+            self.owners.discard(owner)
+            if not self.owners:
+                self._result = None
+                self.released = True
+        return result
+
+
+def _run(job, fn, args, kwargs):
+    job.check_cancelled()
+    with diagnostics.session(job.owner):
+        job._result = fn(job, *args, **kwargs)
+    job.report(1.0)
+
+
+def _prune():
+    finished = [key for key, job in _jobs.items() if job.done()]
+    for key in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+        del _jobs[key]
+
+
+def submit(name, key, fn, *args, owner=None, pool='default', **kwargs):
+    """Run ``fn(job, *args, **kwargs)`` in the background and return its Job.
+
+    ``pool`` is ``'fit'`` for model fitting and ``'default'`` otherwise.
+
+    If a job with the same ``key`` is pending, running or finished
+    successfully with its result still held, it is returned instead of
+    starting a new one, and ``owner`` is added to its owners. A ``key`` of
+    None always starts a new job.
+    """
+    with _lock:
+        job = _jobs.get(key) if key is not None else None
+        if job is not None and not job.released and job.status not in ("failed", "cancelled"):
+            _jobs.move_to_end(key)
+            if owner is not None:
+                job.owners.add(owner)
+            return job
+        job = Job(key if key is not None else uuid.uuid4().hex, name, owner)
+        job._future = _executors[pool].submit(_run, job, fn, args, kwargs)
+        _jobs[job.key] = job
+        _prune()
+    return job
+
+
+def get(key):
+    """Return the job submitted under ``key``, or None if it is unknown."""
+    with _lock:
+        return _jobs.get(key)
+
+
+def discard(key):
+    """Forget the finished job submitted under ``key`` so it is not reused."""
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.done():
+            del _jobs[key]
@@ -0,0 +1,65 @@
+"""Outlier detection and removal behind the Outlier Detection page."""
+import numpy as np
+
+from insight_bench import diagnostics
+
+
+@diagnostics.timed("outliers.zscore")
+def detect_outliers_zscore(data, column, threshold=3):
+    mean = np.mean(data[column])
+    std = np.std(data[column])
+    z_scores = (data[column] - mean) / std
+    return data[np.abs(z_scores) > threshold]
+
+
+@diagnostics.timed("outliers.iqr")
+def detect_outliers_iqr(data, column):
+    Q1 = data[column].quantile(0.25)
+    Q3 = data[column].quantile(0.75)
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    return data[(data[column] < lower_bound) | (data[column] > upper_bound)]
+
+
+@diagnostics.timed("outliers.mad")
+def detect_outliers_mad(data, column, threshold=3.5):
+    median = np.median(data[column])
+    mad = np.median(np.abs(data[column] - median))
+    modified_zscore = 0.6745 * (data[column] - median) / mad
+    return data[np.abs(modified_zscore) > threshold]
+
+
+@diagnostics.timed("outliers.bounds")
+def outlier_bounds(data, column, method, threshold=3.5):
+    """Return the (lower, upper) range of values ``remove_outliers`` keeps.
+
+    The bounds are the method's score threshold mapped back onto the column,
+    so they can be stored and applied to new data without refitting.
+    """
+    if method == "Z-score":
+        mean = np.mean(data[column])
+        std = np.std(data[column])
+        return mean - threshold * std, mean + threshold * std
+    elif method == "IQR":
+        Q1 = data[column].quantile(0.25)
+        Q3 = data[column].quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        return lower_bound, upper_bound
+    else:
+        median = np.median(data[column])
+        mad = np.median(np.abs(data[column] - median))
+        return median - threshold * mad / 0.6745, median + threshold * mad / 0.6745
+
+
+@diagnostics.timed("outliers.filter_range")
+def filter_range(data, column, lower, upper):
+    """Keep the rows whose ``column`` lies within [lower, upper]."""
+    return data[(data[column] >= lower) & (data[column] <= upper)]
+
+
+def remove_outliers(data, column, method, threshold=3.5):
+    lower, upper = outlier_bounds(data, column, method, threshold)
+    return filter_range(data, column, lower, upper)
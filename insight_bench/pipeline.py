@@ -0,0 +1,352 @@
+"""Declarative pipelines built from the page operations.
+
+A pipeline is a list of steps, each a dict naming an ``op`` and its
+parameters, typically loaded from JSON::
+
+    {"steps": [
+        {"op": "remove_duplicates", "keep": "first"},
+        {"op": "handle_missing_values", "strategies": {"tempo": "Median"}},
+        {"op": "remove_outliers", "column": "tempo", "method": "IQR"},
+        {"op": "select_features", "target": "track_popularity", "n_features": 5},
+        {"op": "split", "test_size": 0.2, "random_state": 42}
+    ]}
+
+``split`` may only be the last step, since it turns one frame into several.
+
+Steps such as ``handle_missing_values`` fit their parameters on whatever data
+they are applied to. The pages instead record fitted steps (``fill_missing``,
+``filter_range``, ``select_columns`` and so on) that carry the fill values,
+outlier bounds and columns chosen interactively. A pipeline made only of
+streamable steps is replayed by ``stream`` in a single pass over a file,
+applying every step to one chunk of rows before the next chunk is read.
+Every chunk is parsed with the column types of the first one, so values
+compare and print the same throughout. If a later chunk does not fit those
+types, the file is scanned once for the types of the whole of it and the
+replay starts over with them.
+"""
+import contextlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from insight_bench import diagnostics, export
+from insight_bench.cleaning import DataQualityChecker
+from insight_bench.features import (
+    get_correlation_importance, get_lasso_feature_importance, get_tree_feature_importance
+)
+from insight_bench.outliers import filter_range, remove_outliers
+from insight_bench.splitting import split_data
+
+ENCODINGS = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
+CHUNK_ROWS = 100_000
+
+
+@diagnostics.timed("pipeline.read_csv")
+def read_csv(path, encoding=None):
+    """Read a CSV, trying each of ``ENCODINGS`` unless ``encoding`` is given."""
+    encodings = [encoding] if encoding else ENCODINGS
+    for enc in encodings[:-1]:
+        try:
+            return pd.read_csv(path, encoding=enc)
+        except UnicodeDecodeError:
+            continue
+    return pd.read_csv(path, encoding=encodings[-1])
+
+
+def remove_duplicates(df, subset=None, keep='first'):
+    """Drop duplicate rows, as on the Data Cleaning page."""
+    return DataQualityChecker(df).remove_duplicates(subset=subset, keep=keep)
+
+
+def handle_missing_values(df, strategies):
+    """Fill or drop missing values using the Data Cleaning page's strategy names."""
+    return DataQualityChecker(df).handle_missing_values(strategies)
+
+
+def select_features(df, target, method='Correlation', n_features=None, alpha=1.0, threshold=0.0):
+    """Keep the ``n_features`` most important numeric features and the target."""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    X = df[[col for col in numeric_cols if col != target]]
+    y = df[target]
+    if method == 'Lasso':
+        importance = get_lasso_feature_importance(X, y, alpha)
+    elif method == 'Tree-based':
+        importance = get_tree_feature_importance(X, y)
+    else:
+        importance = get_correlation_importance(X, y, threshold)
+    return df[importance.head(n_features)['Feature'].tolist() + [target]]
+
+
+def drop_missing(df, columns):
+    """Drop rows with a missing value in any of ``columns``."""
+    return df.dropna(subset=columns)
+
+
+def fill_missing(df, values):
+    """Fill missing values with a fixed value per column."""
+    return df.fillna(values)
+
+
+def forward_fill(df, columns):
+    """Fill missing values in ``columns`` from the previous row."""
+    df = df.copy()
+    for column in columns:
+        df[column] = df[column].ffill()
+    return df
+
+
+def backward_fill(df, columns):
+    """Fill missing values in ``columns`` from the next row."""
+    df = df.copy()
+    for column in columns:
+        df[column] = df[column].bfill()
+    return df
+
+
+def select_columns(df, columns):
+    """Keep only ``columns``, in that order."""
+    return df[columns]
+
+
+STEPS = {
+    'remove_duplicates': remove_duplicates,
+    'handle_missing_values': handle_missing_values,
+    'remove_outliers': remove_outliers,
+    'select_features': select_features,
+    'drop_missing': drop_missing,
+    'fill_missing': fill_missing,
+    'forward_fill': forward_fill,
+    'backward_fill': backward_fill,
+    'filter_range': filter_range,
+    'select_columns': select_columns,
+}
+
+STREAMABLE = {'remove_duplicates', 'drop_missing', 'fill_missing', 'forward_fill', 'filter_range', 'select_columns'}
+
+
+def validate(steps):
+    """Raise ValueError if ``steps`` is not a well-formed pipeline."""
+    for i, step in enumerate(steps):
+        op = step.get('op')
+        if op != 'split' and op not in STEPS:
+            raise ValueError(f"Unknown pipeline step: {op!r}")
+        if op == 'split' and i != len(steps) - 1:
+            raise ValueError("'split' must be the last pipeline step")
+
+
+@diagnostics.timed("pipeline.run")
+def run(df, steps):
+    """Apply ``steps`` to ``df`` and return a list of (name, DataFrame) outputs."""
+    validate(steps)
+    for step in steps:
+        params = {key: value for key, value in step.items() if key != 'op'}
+        if step['op'] == 'split':
+            return [(filename, subset) for _, filename, subset in split_data(df, **params)]
+        df = STEPS[step['op']](df, **params)
+    return [('cleaned', df)]
+
+
+def is_streamable(steps):
+    """Return whether ``steps`` can be replayed one chunk of rows at a time.
+
+    Steps that fit parameters, backward fill and duplicate removal that
+    keeps anything but the first occurrence all need the whole dataset.
+    """
+    return all(
+        step['op'] in STREAMABLE
+        and not (step['op'] == 'remove_duplicates' and step.get('keep', 'first') != 'first')
+        for step in steps
+    )
+
+
+class _HashSet:
+    """A set of 64-bit hashes in an open-addressing table, probed an array at a time.
+
+    Hashes are spread evenly already, so their low bits pick the slot and
+    collisions move on to the next slot. Zero marks an empty slot, so the
+    hash 0 is tracked by a flag. The table doubles once it is more than
+    ``MAX_LOAD`` full, so adding a chunk costs the same however many hashes
+    are already in the set.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity=1 << 16):
+        self.table = np.zeros(capacity, dtype=np.uint64)
+        self.size = 0
+        self.has_zero = False
+
+    def _insert(self, hashes):
+        """Insert distinct nonzero ``hashes`` and return which were not present."""
+        table = self.table
+        mask = np.uint64(len(table) - 1)
+        new = np.zeros(len(hashes), dtype=bool)
+        pending = np.arange(len(hashes))
+        slots = hashes & mask
+        while len(pending):
+            waiting = hashes[pending]
+            current = table[slots]
+            empty = current == 0
+            # Hashes racing for the same empty slot all write it; the one read
+            # back afterwards won, and the rest probe on.
+            table[slots[empty]] = waiting[empty]
+            won = np.zeros(len(pending), dtype=bool)
+            won[empty] = table[slots[empty]] == waiting[empty]
+            new[pending[won]] = True
+            done = won | (current == waiting)
+            pending = pending[~done]
+            slots = (slots[~done] + np.uint64(1)) & mask
+        return new
+
+    def add(self, hashes):
+        """Add the distinct ``hashes`` and return which of them were not in the set."""
+        new = np.zeros(len(hashes), dtype=bool)
+        zero = hashes == 0
+        if zero.any():
+            new[zero] = not self.has_zero
+            self.has_zero = True
+        needed = self.size + len(hashes)
+        if needed > self.MAX_LOAD * len(self.table):
+            stored = self.table[self.table != 0]
+            capacity = len(self.table)
+            while needed > self.MAX_LOAD * capacity:
+                capacity *= 2
+            self.table = np.zeros(capacity, dtype=np.uint64)
+            self._insert(stored)
+        rest = np.flatnonzero(~zero)
+        new[rest] = self._insert(hashes[rest])
+        self.size += int(new.sum())
+        return new
+
+
+def _stream_step(chunk, step, state):
+    """Apply one step to a chunk, carrying what it needs across chunks in ``state``.
+
+    Streamed ``remove_duplicates`` remembers rows by a 64-bit hash, so two
+    distinct rows whose hashes collide are taken for duplicates and the
+    later one is dropped. Among n distinct rows that happens with a
+    probability of about n**2 / 2**65, roughly one in a thousand for 200
+    million rows.
+    """
+    params = {key: value for key, value in step.items() if key != 'op'}
+    if step['op'] == 'remove_duplicates':
+        # Rows are remembered by a 64-bit hash rather than by value, so two
+        # distinct rows with the same hash are taken for duplicates.
+        seen = state.setdefault('seen', _HashSet())
+        subset = params.get('subset')
+        hashes = pd.util.hash_pandas_object(chunk[subset] if subset else chunk, index=False).to_numpy()
+        unique, first = np.unique(hashes, return_index=True)
+        keep = np.zeros(len(chunk), dtype=bool)
+        keep[first[seen.add(unique)]] = True
+        return chunk[keep]
+    if step['op'] == 'forward_fill':
+        chunk = chunk.copy()
+        for column in params['columns']:
+            filled = chunk[column].ffill()
+            if column in state:
+                filled = filled.fillna(state[column])
+            valid = filled.dropna()
+            if not valid.empty:
+                state[column] = valid.iloc[-1]
+            chunk[column] = filled
+        return chunk
+    return STEPS[step['op']](chunk, **params)
+
+
+class _TypesChanged(Exception):
+    """A later chunk does not fit the column types of the first one."""
+
+
+@contextlib.contextmanager
+def _open_source(source):
+    """Yield ``source`` as a binary handle at its start, and its size in bytes."""
+    with contextlib.ExitStack() as stack:
+        handle = source if hasattr(source, 'read') else stack.enter_context(open(source, 'rb'))
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(0)
+        yield handle, size
+
+
+def _read_dtypes(source, encoding, chunk_rows):
+    """Return column types that fit every row of ``source``.
+
+    Numeric columns take the widest type seen in any chunk; columns whose
+    type differs otherwise are read as objects.
+    """
+    dtypes = None
+    with _open_source(source) as (handle, _):
+        with pd.read_csv(handle, encoding=encoding, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                if dtypes is None:
+                    dtypes = dict(chunk.dtypes)
+                    continue
+                for column, dtype in chunk.dtypes.items():
+                    current = dtypes[column]
+                    if current == dtype:
+                        continue
+                    numeric = all(
+                        pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t)
+                        for t in (current, dtype)
+                    )
+                    dtypes[column] = np.result_type(current, dtype) if numeric else object
+    return dtypes
+
+
+def _replay_chunks(source, steps, encoding, chunk_rows, job, dtypes=None):
+    """Yield the chunks of ``source`` with ``steps`` applied.
+
+    Without ``dtypes`` the types of the first chunk are used for all of them,
+    and _TypesChanged is raised if a later chunk does not fit them.
+    """
+    states = [{} for _ in steps]
+    rows = 0
+    with _open_source(source) as (handle, size):
+        probed = dtypes is None
+        if probed:
+            dtypes = dict(pd.read_csv(handle, encoding=encoding, nrows=chunk_rows).dtypes)
+            handle.seek(0)
+        with pd.read_csv(handle, encoding=encoding, chunksize=chunk_rows, dtype=dtypes) as reader:
+            while True:
+                if job is not None:
+                    job.check_cancelled()
+                try:
+                    with np.errstate(invalid='ignore'):
+                        chunk = next(reader)
+                except StopIteration:
+                    return
+                except (TypeError, ValueError) as e:
+                    if probed:
+                        raise _TypesChanged() from e
+                    raise
+                rows += len(chunk)
+                for step, state in zip(steps, states):
+                    chunk = _stream_step(chunk, step, state)
+                if job is not None:
+                    job.report(min(handle.tell() / size, 1.0) if size else 1.0, f"{rows} rows replayed")
+                yield chunk
+
+
+@diagnostics.timed("pipeline.stream")
+def stream(source, steps, target, compression='none', encoding=None, chunk_rows=CHUNK_ROWS, job=None):
+    """Replay streamable ``steps`` over the CSV ``source`` and write the result to ``target``.
+
+    Only one chunk of rows is in memory at a time. Without an explicit
+    ``encoding`` each of ``ENCODINGS`` is tried, restarting on a decode error.
+    """
+    if not is_streamable(steps):
+        raise ValueError("Pipeline has steps that need the whole dataset and cannot be streamed")
+    encodings = [encoding] if encoding else ENCODINGS
+    for enc in encodings:
+        try:
+            try:
+                export.write_csv_chunks(_replay_chunks(source, steps, enc, chunk_rows, job), target, compression)
+            except _TypesChanged:
+                dtypes = _read_dtypes(source, enc, chunk_rows)
+                export.write_csv_chunks(
+                    _replay_chunks(source, steps, enc, chunk_rows, job, dtypes), target, compression
+                )
+            return
+        except UnicodeDecodeError:
+            if enc == encodings[-1]:
+                raise
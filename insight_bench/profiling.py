@@ -0,0 +1,35 @@
+"""Column scans behind the Column Information, Distribution and Categorical pages."""
+import numpy as np
+
+from insight_bench import diagnostics, stats
+
+
+@diagnostics.timed("profiling.column_profile")
+def column_profile(column_data):
+    """Summarise a single column for the expander view.
+
+    This is ``DatasetStats.profile`` without any cached statistics.
+    """
+    data = column_data.to_frame()
+    return stats.DatasetStats(data).profile(data, data.columns[0])
+
+
+@diagnostics.timed("profiling.distribution_columns")
+def distribution_columns(data):
+    """Return the numeric columns with a meaningful spread of values."""
+    return [
+        col for col in data.select_dtypes(include=[np.number]).columns
+        if 2 < data[col].nunique() < len(data) and (data[col].value_counts(normalize=True).max() < 0.9)
+    ]
+
+
+@diagnostics.timed("profiling.categorical_columns")
+def categorical_columns(data):
+    """Return the object columns with few distinct values relative to the row count."""
+    def is_categorical(column):
+        num_unique = data[column].nunique()
+        total_rows = len(data)
+        dtype = data[column].dtype
+        return num_unique <= 0.1 * total_rows and dtype == "object"
+
+    return [col for col in data.columns if is_categorical(col)]
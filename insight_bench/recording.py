@@ -0,0 +1,25 @@
+"""The cleaning pipeline recorded for the session's dataset.
+
+Pages record the fitted steps of every operation they apply to
+``st.session_state['data']``. Loading a new dataset starts a new recording.
+"""
+import streamlit as st
+
+
+def record(steps):
+    """Append fitted pipeline steps to the session's recording."""
+    st.session_state.setdefault('pipeline', []).extend(steps)
+
+
+def reset():
+    """Start a new recording for a freshly loaded dataset."""
+    st.session_state['pipeline'] = []
+    st.session_state.pop('selected_features', None)
+
+
+def recorded_steps():
+    """Return the recorded steps, ending with the selected feature subset if any."""
+    steps = list(st.session_state.get('pipeline', []))
+    if 'selected_features' in st.session_state:
+        steps.append({'op': 'select_columns', 'columns': list(st.session_state['selected_features'])})
+    return steps
@@ -0,0 +1,94 @@
+"""Row samples for the preview mode of the exploration pages.
+
+Previewing runs the read-only pages on a sample of the dataset instead of the
+whole of it. A sample is drawn uniformly without replacement, or stratified
+on a column so every group keeps its share of rows. The interval helpers give
+95% confidence bounds for estimates made from such a sample.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from insight_bench import diagnostics
+
+SAMPLE_ROWS = int(os.environ.get("INSIGHT_BENCH_SAMPLE_ROWS", 100_000))
+SEED = 0
+Z = 1.96
+
+
+@diagnostics.timed("sampling.sample")
+def sample(data, rows, stratify=None, seed=SEED):
+    """Return about ``rows`` rows of ``data`` in their original order.
+
+    With ``stratify`` each distinct value of that column contributes rows in
+    proportion to its frequency, and at least one row while there are no
+    more groups than ``rows``.
+    """
+    if rows >= len(data):
+        return data
+    rng = np.random.default_rng(seed)
+    if stratify is None:
+        positions = np.sort(rng.choice(len(data), size=rows, replace=False))
+        return data.iloc[positions]
+
+    codes, _ = pd.factorize(data[stratify], use_na_sentinel=False)
+    counts = np.bincount(codes)
+    take = np.round(counts * rows / len(data)).astype(np.int64)
+    if len(counts) <= rows:
+        take = np.maximum(take, 1)
+
+    # Shuffle, then stable-sort by group so each group's rows are in random
+    # order and the first ``take`` of every group form the sample.
+    shuffled = rng.permutation(len(data))
+    grouped = shuffled[np.argsort(codes[shuffled], kind='stable')]
+    group_codes = codes[grouped]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(data)) - starts[group_codes]
+    positions = np.sort(grouped[rank < take[group_codes]])
+    return data.iloc[positions]
+
+
+def _finite_population_correction(n, population):
+    if population is None or population <= 1:
+        return 1.0
+    return np.sqrt(max(population - n, 0) / (population - 1))
+
+
+def mean_interval(values, population=None):
+    """Return the mean of ``values`` and the half-width of its 95% interval."""
+    values = values.dropna()
+    n = len(values)
+    if n < 2:
+        return values.mean(), np.nan
+    half_width = Z * values.std() / np.sqrt(n) * _finite_population_correction(n, population)
+    return values.mean(), half_width
+
+
+def proportion_interval(proportions, n, population=None):
+    """Return the lower and upper 95% bounds of sampled ``proportions``.
+
+    Uses the Wilson score interval, which unlike the normal approximation
+    does not collapse to a point for proportions of 0 or 1. The finite
+    population correction is applied through the effective sample size.
+    """
+    correction = _finite_population_correction(n, population)
+    if correction == 0:
+        return proportions.copy(), proportions.copy()
+    n = n / correction ** 2
+    scale = 1 + Z ** 2 / n
+    centre = (proportions + Z ** 2 / (2 * n)) / scale
+    half_width = Z * np.sqrt(proportions * (1 - proportions) / n + Z ** 2 / (4 * n ** 2)) / scale
+    return (centre - half_width).clip(lower=0), (centre + half_width).clip(upper=1)
+
+
+def correlation_interval(correlations, n):
+    """Return the lower and upper 95% bounds of sampled Pearson ``correlations``.
+
+    Uses the Fisher z-transformation, so the bounds are not symmetric.
+    """
+    if n <= 3:
+        return correlations * np.nan, correlations * np.nan
+    z = np.arctanh(correlations.clip(-0.999999, 0.999999))
+    half_width = Z / np.sqrt(n - 3)
+    return np.tanh(z - half_width), np.tanh(z + half_width)
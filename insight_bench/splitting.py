@@ -0,0 +1,34 @@
+"""Train, validation and test splitting behind the Train Test Split page."""
+from insight_bench import diagnostics
+
+
+@diagnostics.timed("splitting.split_data")
+def split_data(data, test_size, random_state, validation_size=None, job=None):
+    """Split data into train and test sets, plus a validation set if requested.
+
+    Returns a list of (label, file name, DataFrame) tuples.
+    """
+    from sklearn.model_selection import train_test_split
+
+    train, test = train_test_split(
+        data,
+        test_size=test_size,
+        random_state=random_state
+    )
+    if validation_size is None:
+        return [("Training Set", "train_set", train), ("Test Set", "test_set", test)]
+
+    if job is not None:
+        job.check_cancelled()
+        job.report(0.5, "Splitting off validation set")
+    val_size_adjusted = validation_size / (1 - test_size)
+    train, val = train_test_split(
+        train,
+        test_size=val_size_adjusted,
+        random_state=random_state
+    )
+    return [
+        ("Training Set", "train_set", train),
+        ("Validation Set", "validation_set", val),
+        ("Test Set", "test_set", test)
+    ]
@@ -0,0 +1,86 @@
+"""Report what a cold start costs in imports.
+
+Run ``python -m insight_bench.startup`` from the repository root. Each page's
+module-level imports, and each heavy library on its own, are timed in a fresh
+interpreter, which is what a new container pays the first time a page opens.
+"""
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+LIBRARIES = [
+    "streamlit",
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "matplotlib.pyplot",
+    "seaborn",
+    "sklearn.ensemble",
+    "sklearn.linear_model",
+    "sklearn.model_selection",
+]
+
+_TIMER = "import time\n_start = time.perf_counter()\n{code}\nprint(time.perf_counter() - _start)"
+
+
+def page_paths():
+    """Return the app's entry point followed by its pages."""
+    return ["Home.py"] + sorted(glob.glob(os.path.join("pages", "*.py")))
+
+
+def top_level_imports(path):
+    """Return the source of the module-level import statements in ``path``."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source, path)
+    return "\n".join(
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def time_imports(code, repeat=3):
+    """Return the best time in seconds a fresh interpreter takes to run ``code``.
+
+    Returns None if the code fails, e.g. because a library is not installed.
+    """
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(code=code)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def _print_table(title, rows):
+    width = max(len(name) for name, _ in rows)
+    print(f"{title:<{width}}  seconds")
+    for name, seconds in rows:
+        print(f"{name:<{width}}  {'failed' if seconds is None else f'{seconds:.3f}'}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, best is reported")
+    args = parser.parse_args(argv)
+
+    _print_table("Page imports", [
+        (path, time_imports(top_level_imports(path), args.repeat)) for path in page_paths()
+    ])
+    _print_table("Library", [
+        (name, time_imports(f"import {name}", args.repeat)) for name in LIBRARIES
+    ])
+
+
+if __name__ == "__main__":
+    main()
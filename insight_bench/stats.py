@@ -0,0 +1,282 @@
+"""Column statistics that follow the dataset through cleaning operations.
+
+Null counts, sums, minima and maxima, value counts and the sufficient
+statistics of the correlation matrix are cached with the dataset they
+describe. Each is computed the first time a page asks for it. When a
+cleaning operation derives a new dataset and reports which rows it removed
+and which it modified, ``derive`` updates the parent's statistics from just
+those rows instead of rescanning the result. Minima and maxima are only
+dropped, to be recomputed on demand, when a removed value may have been the
+extreme. Statistics fall back to a full scan when the operation changed the
+columns or their types, or touched too many rows for an update to pay off.
+
+Statistics are pickled under ``ARTIFACT``, whose version must be bumped
+whenever ``DatasetStats`` changes shape; an artifact that cannot be loaded
+is simply recomputed. Pages that read many statistics per run ``load`` them
+once and ``save`` them once rather than calling ``statistic`` repeatedly.
+"""
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+
+from insight_bench import cache, diagnostics
+
+MAX_TRACKED_VALUES = int(os.environ.get("INSIGHT_BENCH_STATS_MAX_VALUES", 10_000))
+MAX_TRACKED_FRACTION = 0.1
+MAX_CORR_COLUMNS = 200
+MAX_DELTA_FRACTION = 0.5
+ARTIFACT = 'stats:v1'
+
+
+def _numeric(data):
+    return data.select_dtypes(include=[np.number])
+
+
+def _summable(data):
+    """Return the columns ``profile`` shows a mean for, booleans included."""
+    return data[[column for column in data.columns if pd.api.types.is_numeric_dtype(data[column])]]
+
+
+def _moments(numeric, shift):
+    """Return the pairwise-complete sums behind a Pearson correlation matrix.
+
+    Values are shifted by ``shift`` (the column means when first computed)
+    to keep the sums of squares small.
+    """
+    present = numeric.notna().to_numpy(dtype=np.float64)
+    centred = np.nan_to_num(numeric.to_numpy(dtype=np.float64) - shift)
+    return {
+        'n': present.T @ present,
+        'sx': centred.T @ present,
+        'sxx': (centred * centred).T @ present,
+        'sxy': centred.T @ centred,
+    }
+
+
+class DatasetStats:
+    """Lazily computed statistics of one dataset version.
+
+    Query methods take the dataset itself so they can compute a statistic
+    that is missing or stale; ``dirty`` is set when they did.
+    """
+
+    def __init__(self, data):
+        self.rows = len(data)
+        self.columns = list(data.columns)
+        self.nulls = None
+        self.sums = None
+        self.minimums = {}
+        self.maximums = {}
+        self.value_counts = {}
+        self.distinct = {}
+        self.moments = None
+        self.dirty = False
+
+    def null_counts(self, data):
+        if self.nulls is None:
+            self.nulls = data.isnull().sum()
+            self.dirty = True
+        return self.nulls
+
+    def mean(self, data, column):
+        if self.sums is None:
+            self.sums = _summable(data).sum()
+            self.dirty = True
+        count = self.rows - self.null_counts(data)[column]
+        return self.sums[column] / count if count else np.nan
+
+    def minimum(self, data, column):
+        if column not in self.minimums:
+            self.minimums[column] = data[column].min()
+            self.dirty = True
+        return self.minimums[column]
+
+    def maximum(self, data, column):
+        if column not in self.maximums:
+            self.maximums[column] = data[column].max()
+            self.dirty = True
+        return self.maximums[column]
+
+    def counts(self, data, column):
+        """Return the value counts of ``column``, most frequent first.
+
+        Only columns with few distinct values, at most ``MAX_TRACKED_VALUES``
+        and at most ``MAX_TRACKED_FRACTION`` of the rows, keep their counts;
+        others are counted afresh on every call.
+        """
+        if column in self.value_counts:
+            return self.value_counts[column]
+        counts = data[column].value_counts()
+        if self._trackable(len(counts)):
+            self.value_counts[column] = counts
+            self.dirty = True
+        return counts
+
+    def _trackable(self, distinct):
+        return distinct <= min(MAX_TRACKED_VALUES, self.rows * MAX_TRACKED_FRACTION)
+
+    def nunique(self, data, column):
+        if column in self.value_counts:
+            return len(self.value_counts[column])
+        if column not in self.distinct:
+            self.distinct[column] = data[column].nunique()
+            self.dirty = True
+        return self.distinct[column]
+
+    def corr(self, data):
+        """Return the Pearson correlation matrix of the numeric columns."""
+        numeric = _numeric(data)
+        if numeric.shape[1] > MAX_CORR_COLUMNS:
+            return numeric.corr()
+        if self.moments is None:
+            shift = numeric.mean().fillna(0).to_numpy()
+            self.moments = {'columns': list(numeric.columns), 'shift': shift, **_moments(numeric, shift)}
+            self.dirty = True
+        m = self.moments
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = m['n'] * m['sxy'] - m['sx'] * m['sx'].T
+            variance = m['n'] * m['sxx'] - m['sx'] ** 2
+            corr = covariance / np.sqrt(variance * variance.T)
+        corr[m['n'] < 2] = np.nan
+        np.fill_diagonal(corr, np.where(np.isnan(np.diag(corr)), np.nan, 1.0))
+        corr = np.clip(corr, -1.0, 1.0)
+        return pd.DataFrame(corr, index=m['columns'], columns=m['columns'])
+
+    def profile(self, data, column):
+        """Summarise ``column`` for the Column Information page."""
+        column_data = data[column]
+        profile = {
+            'dtype': column_data.dtype,
+            'num_unique': self.nunique(data, column),
+            'null_count': self.null_counts(data)[column],
+            'preview': column_data.dropna().head(4).tolist(),
+        }
+        if pd.api.types.is_numeric_dtype(column_data):
+            profile['mean'] = self.mean(data, column)
+            profile['min'] = self.minimum(data, column)
+            profile['max'] = self.maximum(data, column)
+        return profile
+
+    def _apply(self, rows, sign):
+        """Add (``sign=1``) or subtract (``sign=-1``) the contribution of ``rows``."""
+        if rows.empty:
+            return
+        self.rows += sign * len(rows)
+        if self.nulls is not None:
+            self.nulls = self.nulls + sign * rows.isnull().sum()
+        if self.sums is not None:
+            self.sums = self.sums + sign * rows[self.sums.index].sum()
+
+        for column in list(self.value_counts):
+            counts = self._update_counts(self.value_counts[column], rows[column].value_counts(), sign)
+            if self._trackable(len(counts)):
+                self.value_counts[column] = counts
+            else:
+                del self.value_counts[column]
+        self.distinct.clear()
+
+        for extremes, pick, outside in ((self.minimums, min, np.less_equal), (self.maximums, max, np.greater_equal)):
+            for column in list(extremes):
+                values = rows[column].dropna()
+                if values.empty:
+                    continue
+                extreme = values.min() if pick is min else values.max()
+                if sign > 0:
+                    current = extremes[column]
+                    extremes[column] = extreme if pd.isna(current) else pick(current, extreme)
+                elif outside(extreme, extremes[column]):
+                    # A removed value may have been the extreme; recompute when asked.
+                    del extremes[column]
+
+        if self.moments is not None:
+            delta = _moments(rows[self.moments['columns']], self.moments['shift'])
+            for name, value in delta.items():
+                self.moments[name] = self.moments[name] + sign * value
+
+    @staticmethod
+    def _update_counts(counts, delta, sign):
+        positions = counts.index.get_indexer(delta.index)
+        values = counts.to_numpy(copy=True)
+        found = positions >= 0
+        np.add.at(values, positions[found], sign * delta.to_numpy()[found])
+        counts = pd.Series(values, index=counts.index, name=counts.name)
+        if sign > 0 and not found.all():
+            counts = pd.concat([counts, delta[~found]])
+        counts = counts[counts > 0]
+        return counts.iloc[np.argsort(-counts.to_numpy(), kind='stable')]
+
+    def updated(self, after, removed, old, new):
+        """Return the statistics of ``after``, or None if they must be recomputed.
+
+        ``removed`` holds the rows that were dropped, and ``old`` and ``new``
+        the kept rows that changed, before and after the change.
+        """
+        if list(after.columns) != self.columns:
+            return None
+        if len(removed) + len(old) > self.rows * MAX_DELTA_FRACTION:
+            return None
+        stats = copy.deepcopy(self)
+        stats._apply(removed, -1)
+        stats._apply(old, -1)
+        stats._apply(new, 1)
+        stats.dirty = False
+        return stats if stats.rows == len(after) else None
+
+
+def _load(key):
+    stats = cache.load_artifact(key, ARTIFACT) if key is not None else None
+    return stats if isinstance(stats, DatasetStats) else None
+
+
+def load(key, data):
+    """Return the cached statistics of dataset ``key``, or empty ones for ``data``."""
+    stats = _load(key)
+    return stats if stats is not None else DatasetStats(data)
+
+
+def save(key, stats):
+    """Cache ``stats`` as those of dataset ``key`` if anything was computed.
+
+    A ``key`` of None means the dataset is untracked, so nothing is kept.
+    """
+    if stats.dirty and key is not None:
+        stats.dirty = False
+        cache.store_artifact(key, ARTIFACT, stats)
+
+
+def statistic(key, data, name, *args):
+    """Return ``DatasetStats.<name>(data, *args)`` for dataset ``key``.
+
+    Whatever had to be computed is cached with the dataset's statistics.
+    """
+    stats = load(key, data)
+    value = getattr(stats, name)(data, *args)
+    save(key, stats)
+    return value
+
+
+@diagnostics.timed("stats.derive")
+def derive(parent_key, key, before, after, removed=None, modified=None):
+    """Cache the statistics of ``after`` by updating those of ``before``.
+
+    ``after`` is dataset ``key``, derived from dataset ``parent_key``
+    (``before``) by dropping the rows labelled ``removed`` and changing the
+    rows labelled ``modified``. If ``removed`` is None it is worked out from
+    the indexes. Nothing is cached when the parent has no statistics yet or
+    they cannot be updated; they are then computed on demand.
+    """
+    if parent_key is None or key is None or not before.index.is_unique:
+        return
+    if not before.dtypes.equals(after.dtypes):
+        return
+    parent = _load(parent_key)
+    if parent is None or _load(key) is not None:
+        return
+    if removed is None:
+        removed = before.index[~before.index.isin(after.index)]
+    modified = pd.Index(modified if modified is not None else []).difference(removed)
+    stats = parent.updated(after, before.loc[removed], before.loc[modified], after.loc[modified])
+    if stats is not None:
+        cache.store_artifact(key, ARTIFACT, stats)
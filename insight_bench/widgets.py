@@ -0,0 +1,246 @@
+"""Streamlit widgets shared by the pages."""
+import functools
+import os
+import secrets
+import time
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from insight_bench import cache, diagnostics, export, jobs, sampling
+
+
+def session_id():
+    """Return the id of the session running the script, or None outside one."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def submit_job(name, key, fn, pool='default'):
+    """Submit ``fn`` as a background job on behalf of the current session."""
+    return jobs.submit(name, key, fn, owner=session_id(), pool=pool)
+
+
+def await_job(job, label):
+    """Show the progress of ``job`` with a cancel button until it finishes.
+
+    Returns the job's result, or None if it failed or was cancelled. The
+    result is consumed: the job registry stops holding it for this session,
+    so callers keep it themselves. Cancelling only stops the job if no other
+    session waits for it. A widget interaction reruns the script and abandons
+    the wait, but not the job, so the page picks it up again on the next run.
+    """
+    owner = session_id()
+    if not job.done():
+        if st.button("Cancel", key=f"cancel_{job.key}"):
+            job.cancel(owner)
+        bar = st.progress(job.progress, text=label)
+        while not job.done() and job.watched_by(owner):
+            time.sleep(0.2)
+            text = f"{label}: {job.message}" if job.message else label
+            bar.progress(job.progress, text=text)
+        bar.empty()
+
+    if job.status == "cancelled" or not job.watched_by(owner):
+        st.warning(f"{label} was cancelled.")
+        return None
+    if job.status == "failed":
+        st.error(f"{label} failed: {job.exception()}")
+        return None
+    try:
+        return job.consume(owner)
+    except jobs.JobCancelled:
+        st.warning(f"{label} was cancelled.")
+        return None
+    except LookupError:
+        st.warning(f"The result of {label.lower()} is no longer available; please run it again.")
+        return None
+
+
+def job_result(entry, label):
+    """Return the result of the job recorded in the session state ``entry``.
+
+    The first call waits for the job and keeps its result in ``entry``;
+    later calls return the kept result. Returns None if there is no result.
+    """
+    if 'result' not in entry:
+        job = jobs.get(entry['job'])
+        result = await_job(job, label) if job is not None else None
+        if result is None:
+            return None
+        entry['result'] = result
+    return entry['result']
+
+
+def export_download(filename, key, source_key, label, write):
+    """Offer a download whose file is only written once requested.
+
+    ``write(path, compression, job)`` writes the export to ``path``.
+    ``source_key`` identifies what is being exported so repeated requests
+    reuse the file already written. Each session exports into its own
+    directory, so the download link only works for those it was shown to.
+    """
+    compression = st.selectbox("Compression", export.COMPRESSIONS, key=f"{key}_compression")
+    entry_name = f"export_{key}"
+    token = st.session_state.setdefault('export_token', secrets.token_urlsafe(16))
+
+    def prepare(compression):
+        export_key = cache.derive_key(source_key, 'export', token, filename, compression)
+        job = submit_job(
+            f"Export of {filename}",
+            export_key,
+            lambda job: export.export_file(
+                filename, compression, export_key, lambda path: write(path, compression, job), token
+            )
+        )
+        st.session_state[entry_name] = {'job': job.key, 'source_key': source_key, 'compression': compression}
+
+    if st.button(label, key=f"{key}_prepare"):
+        prepare(compression)
+
+    entry = st.session_state.get(entry_name)
+    if entry is None or entry['source_key'] != source_key:
+        return
+    path = job_result(entry, f"Export of {filename}")
+    if path is not None and not os.path.exists(path):
+        # The file was pruned since it was prepared; write it again.
+        jobs.discard(entry['job'])
+        prepare(entry['compression'])
+        entry = st.session_state[entry_name]
+        path = job_result(entry, f"Export of {filename}")
+    if path is None or not os.path.exists(path):
+        return
+    name = export.file_name(filename, entry['compression'])
+    if not export.servable(path):
+        # Too large for the static file server; send the file through the session instead.
+        with open(path, 'rb') as f:
+            st.download_button(f"Download {name}", f, file_name=name, key=f"{key}_download")
+        return
+    st.markdown(
+        f'<a href="{export.url_for(path)}" download="{name}">Download {name}</a>',
+        unsafe_allow_html=True
+    )
+
+
+def csv_download(df, filename, key, source_key=None, label="Prepare CSV download"):
+    """Offer ``df`` as a CSV download that is only written once requested."""
+    export_download(
+        filename, key, source_key, label,
+        lambda path, compression, job: export.write_csv(df, path, compression, job)
+    )
+
+
+def preview_settings(data):
+    """Render the sidebar controls of preview mode and return its settings.
+
+    The settings live in ``st.session_state['preview']`` so they carry over
+    between pages.
+    """
+    settings = st.session_state.setdefault(
+        'preview', {'enabled': False, 'rows': sampling.SAMPLE_ROWS, 'stratify': None}
+    )
+    with st.sidebar.expander("Preview on sample", expanded=settings['enabled']):
+        settings['enabled'] = st.toggle(
+            "Run exploration pages on a sample", value=settings['enabled'],
+            help="Results are estimates; each page can still be run on the full data."
+        )
+        settings['rows'] = int(st.number_input(
+            "Sample rows", min_value=1, value=max(settings['rows'], 1), step=10_000
+        ))
+        options = [None] + data.select_dtypes(include=['object', 'category', 'string', 'bool']).columns.tolist()
+        if settings['stratify'] not in options:
+            settings['stratify'] = None
+        settings['stratify'] = st.selectbox(
+            "Stratify by", options, index=options.index(settings['stratify']),
+            format_func=lambda column: "Nothing (uniform sample)" if column is None else column
+        )
+    return settings
+
+
+def _preview_sample(data, data_key, rows, stratify):
+    sample_key = cache.derive_key(data_key, 'sample', rows, stratify)
+    memo = st.session_state.get('preview_sample')
+    if memo is not None and memo['parent'] is data and memo['settings'] == (rows, stratify):
+        return memo['data'], sample_key
+
+    sample = cache.cached_dataset(sample_key, lambda: sampling.sample(data, rows, stratify))
+    st.session_state['preview_sample'] = {'parent': data, 'settings': (rows, stratify), 'data': sample}
+    return sample, sample_key
+
+
+def preview_data(name):
+    """Return the data a read-only page should work on, and its cache key.
+
+    Without preview mode this is ``st.session_state['data']`` and its key.
+    With it, datasets larger than the sample size are replaced by a sample
+    cached per dataset version, and a button lets the page ``name`` compute
+    the exact result on the full data instead.
+    """
+    data = st.session_state['data']
+    data_key = st.session_state.get('data_key')
+    settings = preview_settings(data)
+    if not settings['enabled'] or len(data) <= settings['rows']:
+        return data, data_key
+
+    entry_name = f"full_{name}"
+    entry = st.session_state.get(entry_name)
+    full = entry is not None and entry['data_key'] == data_key
+    col1, col2 = st.columns([4, 1])
+    if full:
+        col2.button(
+            "Back to sample", key=f"{name}_preview",
+            on_click=lambda: st.session_state.pop(entry_name, None)
+        )
+    else:
+        col2.button(
+            "Run on full data", key=f"{name}_full",
+            on_click=lambda: st.session_state.update({entry_name: {'data_key': data_key}})
+        )
+    if full:
+        col1.caption(f"Computed on all {len(data):,} rows.")
+        return data, data_key
+
+    sample, sample_key = _preview_sample(data, data_key, settings['rows'], settings['stratify'])
+    col1.info(f"Preview on a sample of {len(sample):,} of {len(data):,} rows. Figures are estimates.")
+    return sample, sample_key
+
+
+@functools.lru_cache(maxsize=None)
+def _read_asset(path):
+    with open(path) as f:
+        return f.read()
+
+
+def apply_styles(path="styles.css"):
+    """Inject the shared stylesheet, reading it from disk once per process."""
+    st.markdown(f"<style>{_read_asset(path)}</style>", unsafe_allow_html=True)
+
+
+def diagnostics_panel():
+    """Show recorded operation timings in a collapsible sidebar panel.
+
+    Renders nothing unless diagnostics are enabled. Pages call this last so
+    the operations of the current run are included.
+    """
+    if not diagnostics.ENABLED:
+        return
+    with st.sidebar.expander("Diagnostics"):
+        records = diagnostics.records(session_id())
+        if not records:
+            st.caption("No operations recorded yet.")
+            return
+        table = pd.DataFrame(records[::-1]).drop(columns='session')
+        table['timestamp'] = pd.to_datetime(table['timestamp'], unit='s')
+        aggregations = {'calls': ('seconds', 'count'), 'total_s': ('seconds', 'sum'), 'max_s': ('seconds', 'max')}
+        if 'peak_bytes' in table:
+            # tracemalloc's peak is process-wide: it includes other sessions' work.
+            table['process_peak_mib'] = table.pop('peak_bytes') / 2**20
+            aggregations['max_process_peak_mib'] = ('process_peak_mib', 'max')
+        st.caption("By operation")
+        st.dataframe(table.groupby('op').agg(**aggregations).sort_values('total_s', ascending=False))
+        st.caption("Most recent first")
+        st.dataframe(table, hide_index=True)
+        if st.button("Clear diagnostics", key="diagnostics_clear"):
+            diagnostics.clear(session_id())
+            st.rerun()
@@ -1,10 +1,10 @@
 import streamlit as st
-import pandas as pd
+
+from insight_bench import widgets
 
 st.set_page_config(page_title="Data Head", page_icon="🎩", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
 def main():
     st.markdown("<h1 class='custom-sub'>Data Head</h1>", unsafe_allow_html=True)
@@ -19,4 +19,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
@@ -1,10 +1,10 @@
 import streamlit as st
-import pandas as pd
+
+from insight_bench import stats, widgets
 
 st.set_page_config(page_title="Column Information", page_icon="🏛️", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
 def main():
     st.markdown("<h1 class='custom-sub'>Column Information</h1>", unsafe_allow_html=True)
@@ -16,19 +16,22 @@ def main():
         
         columns = st.columns(2)
         col_index = 0 
+        data_key = st.session_state.get('data_key')
+        dataset_stats = stats.load(data_key, data)
         
         for column in selected_columns:
             with columns[col_index]:
                 with st.expander(f"{column}"):
-                    dtype = data[column].dtype
-                    num_unique = data[column].nunique()
+                    profile = dataset_stats.profile(data, column)
+                    dtype = profile['dtype']
+                    num_unique = profile['num_unique']
                     total_rows = len(data)
                     is_categorical = num_unique <= 0.1 * total_rows and dtype == "object"
                     
                     st.write(f"**Data Type:** {dtype}")
-                    st.write(f"**Null Values:** {data[column].isnull().sum()}")
+                    st.write(f"**Null Values:** {profile['null_count']}")
                     
-                    first_values = data[column].dropna().head(4).tolist()
+                    first_values = profile['preview']
                     st.write(f"**Preview Data:** {', '.join(map(str, first_values))}")
 
                     if is_categorical:
@@ -37,17 +40,16 @@ def main():
                     else:
                         st.write(f"**Categorical Data:** No")
 
-                        if pd.api.types.is_numeric_dtype(data[column]):
-                            mean_value = data[column].mean()
-                            min_value = data[column].min()
-                            max_value = data[column].max()
-                            st.write(f"**Mean:** {mean_value}")
-                            st.write(f"**Minimum:** {min_value}")
-                            st.write(f"**Maximum:** {max_value}")
+                        if 'mean' in profile:
+                            st.write(f"**Mean:** {profile['mean']}")
+                            st.write(f"**Minimum:** {profile['min']}")
+                            st.write(f"**Maximum:** {profile['max']}")
                         
             col_index = (col_index + 1) % 2 
+        stats.save(data_key, dataset_stats)
     else:
         st.write("No data available.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
@@ -1,35 +1,38 @@
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import io
 import numpy as np
-from matplotlib.colors import LinearSegmentedColormap
+
+from insight_bench import diagnostics, sampling, stats, widgets
 
 st.set_page_config(page_title="Correlation Matrix", page_icon="🔢", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
 def main():    
     st.markdown("<h1 class='custom-sub'>Correlation Matrix</h1>", unsafe_allow_html=True)
     st.write("Download the PNG using the button below this chart.")
     if 'data' in st.session_state:
-        data = st.session_state['data']
+        data, data_key = widgets.preview_data('correlation')
         
         numerical_data = data.select_dtypes(include=[np.number])
-
-        hex_colors = ["#ffba49", "#fff", "#20a39e", "#fff","#ffba49"]
-        custom_cmap = LinearSegmentedColormap.from_list("CustomMap", hex_colors)
         
         if not numerical_data.empty:
-            corr_matrix = numerical_data.corr()
+            import seaborn as sns
+            import matplotlib.pyplot as plt
+            from matplotlib.colors import LinearSegmentedColormap
+
+            hex_colors = ["#ffba49", "#fff", "#20a39e", "#fff","#ffba49"]
+            custom_cmap = LinearSegmentedColormap.from_list("CustomMap", hex_colors)
+
+            with diagnostics.measure("correlation.corr", rows=len(numerical_data)):
+                corr_matrix = stats.statistic(data_key, data, 'corr')
             
             fig, ax = plt.subplots(figsize=(12, 10))
-            if numerical_data.shape[1] < 25:
-                sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap=custom_cmap, ax=ax)
-            else:
-                sns.heatmap(corr_matrix, annot=False, cmap="twilight", ax=ax)
+            with diagnostics.measure("correlation.heatmap", columns=numerical_data.shape[1]):
+                if numerical_data.shape[1] < 25:
+                    sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap=custom_cmap, ax=ax)
+                else:
+                    sns.heatmap(corr_matrix, annot=False, cmap="twilight", ax=ax)
             ax.set_title("Correlation Matrix", color='white')
             fig.patch.set_facecolor('#0E1117')
             ax.set_facecolor('#0E1117')
@@ -40,10 +43,12 @@ def main():
             cbar.ax.yaxis.set_tick_params(color='white')
             plt.setp(cbar.ax.yaxis.get_ticklabels(), color='white')
             
-            st.pyplot(fig)
+            with diagnostics.measure("correlation.render"):
+                st.pyplot(fig)
             
             buf = io.BytesIO()
-            fig.savefig(buf, format="png")
+            with diagnostics.measure("correlation.png"):
+                fig.savefig(buf, format="png")
             buf.seek(0)
             st.download_button(
                 label="Download plot as PNG",
@@ -51,6 +56,14 @@ def main():
                 file_name="correlation_matrix.png",
                 mime="image/png",
             )
+
+            if len(data) < len(st.session_state['data']):
+                lower, upper = sampling.correlation_interval(corr_matrix, len(numerical_data))
+                with st.expander("95% confidence bounds of the sampled correlations"):
+                    st.write("Lower bound")
+                    st.dataframe(lower)
+                    st.write("Upper bound")
+                    st.dataframe(upper)
         else:
             st.write("No numerical columns available for correlation matrix.")
     else:
@@ -58,3 +71,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    widgets.diagnostics_panel()
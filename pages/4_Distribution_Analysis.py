@@ -1,15 +1,16 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.colors import LinearSegmentedColormap
+
+from insight_bench import diagnostics, sampling, widgets
+from insight_bench.profiling import distribution_columns
 
 st.set_page_config(page_title="Distribution Analysis", page_icon="✨", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
 def get_color_gradient(color1, color2, n):
+    from matplotlib.colors import LinearSegmentedColormap
+
     cmap = LinearSegmentedColormap.from_list("gradient", [color1, color2], N=n)
     return [cmap(i) for i in range(n)]
 
@@ -17,18 +18,23 @@ def main():
     st.markdown("<h1 class='custom-sub'>Distribution Analysis</h1>", unsafe_allow_html=True)
     
     if 'data' in st.session_state:
-        data = st.session_state['data']
+        data, _ = widgets.preview_data('distribution')
+        population = len(st.session_state['data'])
+        sampled = len(data) < population
       
-        numerical_columns = [
-            col for col in data.select_dtypes(include=[np.number]).columns
-            if 2 < data[col].nunique() < len(data) and (data[col].value_counts(normalize=True).max() < 0.9)
-        ]
+        numerical_columns = distribution_columns(data)
         
         if numerical_columns:
+            import matplotlib.pyplot as plt
+
             selected_column = st.selectbox("Select column to view distribution", options=numerical_columns)
             
+            values = data[selected_column].dropna()
+            # Scale sampled counts up so the bars estimate full-data frequencies.
+            weights = np.full(len(values), population / len(data)) if sampled else None
             fig, ax = plt.subplots(figsize=(10, 6))
-            n, bins, patches = ax.hist(data[selected_column].dropna(), bins=30, edgecolor='black')
+            with diagnostics.measure("distribution.histogram", rows=len(data)):
+                n, bins, patches = ax.hist(values, bins=30, weights=weights, edgecolor='black')
 
             color1 = "#ffba49"
             color2 = "#20a39e"
@@ -38,7 +44,7 @@ def main():
             
             ax.set_title(f'Distribution of {selected_column}', fontsize=14, color='white')
             ax.set_xlabel(selected_column, fontsize=14, color='white')
-            ax.set_ylabel('Frequency', fontsize=14, color='white')
+            ax.set_ylabel('Estimated frequency' if sampled else 'Frequency', fontsize=14, color='white')
             ax.set_facecolor('#0E1117')
             fig.patch.set_facecolor('#0E1117')
             
@@ -47,11 +53,17 @@ def main():
             ax.tick_params(axis='x', colors='white', size=10, width=2)
             ax.tick_params(axis='y', colors='white', size=10, width=2)
             
-            st.pyplot(fig)
+            with diagnostics.measure("distribution.render"):
+                st.pyplot(fig)
+
+            if sampled:
+                mean, half_width = sampling.mean_interval(values, population)
+                st.caption(f"Estimated mean: {mean:.4g} ± {half_width:.2g} (95% confidence)")
         else:
             st.write("No numerical columns with a meaningful spread of values available.")
     else:
         st.write("No data available.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
@@ -1,40 +1,38 @@
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from insight_bench import diagnostics, sampling, stats, widgets
+from insight_bench.profiling import categorical_columns
 
 # Set Streamlit page config
 st.set_page_config(page_title="Categorical Analysis", page_icon="🐈‍⬛", layout="wide")
 
-# Load custom styles
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
 def main():
     st.markdown("<h1 class='custom-sub'>Categorical Analysis</h1>", unsafe_allow_html=True)
     
     if 'data' in st.session_state:
-        data = st.session_state['data']
+        data, data_key = widgets.preview_data('categorical')
+        population = len(st.session_state['data'])
         
         # Identify truly categorical columns
-        def is_categorical(column):
-            num_unique = data[column].nunique()
-            total_rows = len(data)
-            dtype = data[column].dtype
-            return num_unique <= 0.1 * total_rows and dtype == "object"
-        
-        categorical_columns = [col for col in data.columns if is_categorical(col)]
+        categorical = categorical_columns(data)
         
-        if categorical_columns:
+        if categorical:
             # Select a categorical column
-            selected_column = st.selectbox("Select column for categorical analysis", options=categorical_columns)
+            selected_column = st.selectbox("Select column for categorical analysis", options=categorical)
             
             # Generate summary statistics
             summary_stats = data[selected_column].describe()
             
             # Create frequency table with repeat count
-            counts = data[selected_column].value_counts()
+            with diagnostics.measure("categorical.value_counts", rows=len(data)):
+                counts = stats.statistic(data_key, data, 'counts', selected_column)
             proportions = counts / len(data)
+            if len(data) < population:
+                # Sampled counts are scaled up to estimate the full-data counts.
+                counts = (proportions * population).round().astype(int)
             repeat_count = counts.apply(lambda x: f"{x} occurrences") 
             frequency_table = pd.DataFrame({
                 "Category": counts.index,
@@ -42,6 +40,10 @@ def main():
                 "Proportion": proportions.values,
                 "Repeat Count": repeat_count.values  
             })
+            if len(data) < population:
+                lower, upper = sampling.proportion_interval(proportions, len(data), population)
+                frequency_table["Proportion 95% Low"] = lower.values
+                frequency_table["Proportion 95% High"] = upper.values
             st.write(frequency_table)
 
         else:
@@ -50,4 +52,5 @@ def main():
         st.write("No data available.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
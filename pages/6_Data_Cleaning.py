@@ -1,66 +1,65 @@
+import json
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import seaborn as sns
+
+from insight_bench import cache, jobs, pipeline, recording, stats, widgets
+from insight_bench.cleaning import DataQualityChecker
 
 st.set_page_config(page_title="Data Cleaning", page_icon="🧹", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    
-class DataQualityChecker:
-    def __init__(self, data):
-        self.data = data.copy()
-        self.original_shape = data.shape
-        
-    def get_duplicate_info(self):
-        """Get information about duplicate rows."""
-        duplicates = self.data.duplicated(keep='first')
-        duplicate_rows = self.data[duplicates]
-        return {
-            'total_duplicates': len(duplicate_rows),
-            'duplicate_rows': duplicate_rows,
-            'duplicate_indices': duplicates
-        }
+widgets.apply_styles()
     
-    def remove_duplicates(self, subset=None, keep='first'):
-        """Remove duplicate rows."""
-        self.data = self.data.drop_duplicates(subset=subset, keep=keep)
-        return self.data
-    
-    def get_missing_info(self):
-        """Get information about missing values."""
-        missing_count = self.data.isnull().sum()
-        missing_percent = (missing_count / len(self.data)) * 100
-        missing_info = pd.DataFrame({
-            'Missing Count': missing_count,
-            'Missing Percentage': missing_percent
-        })
-        return missing_info[missing_info['Missing Count'] > 0]
-    
-    def handle_missing_values(self, strategy_dict):
-        """Handle missing values according to specified strategies."""
-        df = self.data.copy()
-        
-        for column, strategy in strategy_dict.items():
-            if strategy == 'Drop rows':
-                df = df.dropna(subset=[column])
-            elif strategy == 'Mean':
-                df[column] = df[column].fillna(df[column].mean())
-            elif strategy == 'Median':
-                df[column] = df[column].fillna(df[column].median())
-            elif strategy == 'Mode':
-                df[column] = df[column].fillna(df[column].mode()[0])
-            elif strategy == 'Forward fill':
-                df[column] = df[column].fillna(method='ffill')
-            elif strategy == 'Backward fill':
-                df[column] = df[column].fillna(method='bfill')
-            elif strategy.startswith('Custom value:'):
-                custom_value = strategy.split(':')[1].strip()
-                df[column] = df[column].fillna(custom_value)
-        
-        self.data = df
-        return df
+def run_checker(data, operation):
+    """Apply ``operation`` to a fresh DataQualityChecker and return the checker."""
+    checker = DataQualityChecker(data)
+    operation(checker)
+    return checker
+
+def apply_cleaning_job(entry_name, label):
+    """Wait for the cleaning job recorded under ``entry_name`` and apply its result.
+
+    The job's checker is applied to the session dataset and its fitted steps
+    are added to the recorded pipeline.
+
+    Returns the cleaned data once it replaces the session dataset, or None if
+    there is no job, it is stale, or it failed or was cancelled.
+    """
+    entry = st.session_state.get(entry_name)
+    if entry is None:
+        return None
+    job = jobs.get(entry['job'])
+    if job is None or entry['parent_key'] != st.session_state.get('data_key'):
+        del st.session_state[entry_name]
+        return None
+
+    checker = widgets.await_job(job, label)
+    del st.session_state[entry_name]
+    if checker is None:
+        return None
+    cleaned_data = cache.share_dataset(entry['data_key'], checker.data)
+    st.session_state['data'] = cleaned_data
+    st.session_state['data_key'] = entry['data_key']
+    recording.record(checker.steps)
+    return cleaned_data
+
+def submit_cleaning_job(entry_name, label, operation, fn):
+    """Start a cleaning job on the session dataset and record it under ``entry_name``.
+
+    Once ``fn`` returns its checker, the job updates the cached statistics
+    of the session dataset with the rows the checker changed.
+    """
+    parent_key = st.session_state.get('data_key')
+    data_key = cache.derive_key(parent_key, *operation)
+    data = st.session_state['data']
+
+    def run(job):
+        checker = fn(job)
+        stats.derive(parent_key, data_key, data, checker.data, checker.removed, checker.modified)
+        return checker
+
+    job = widgets.submit_job(label, data_key, run)
+    st.session_state[entry_name] = {'job': job.key, 'parent_key': parent_key, 'data_key': data_key}
 
 def main():
     st.markdown("<h1 class='custom-sub'>Data Cleaning</h1>", unsafe_allow_html=True)
@@ -71,16 +70,18 @@ def main():
     
     checker = DataQualityChecker(st.session_state['data'])
     
-    tab_duplicate, tab_missing = st.tabs(["Duplicate Detection", "Missing Value Analysis"])
+    tab_duplicate, tab_missing, tab_pipeline = st.tabs(
+        ["Duplicate Detection", "Missing Value Analysis", "Recorded Pipeline"]
+    )
 
     col1, col2 = st.columns([6, 1])
     with col2:
-        csv = checker.data.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="Download Cleaned Data",
-            data=csv,
-            file_name='cleaned_data.csv',
-            mime='text/csv'
+        widgets.csv_download(
+            checker.data,
+            'cleaned_data.csv',
+            key='cleaned_data',
+            source_key=st.session_state.get('data_key'),
+            label="Download Cleaned Data"
         )
         
     with tab_duplicate:
@@ -99,28 +100,51 @@ def main():
             horizontal=True
         )
         
+        data = checker.data
         if st.button("Find Duplicates", type="primary"):
-            duplicate_info = checker.get_duplicate_info()
+            data_key = st.session_state.get('data_key')
+            detection_key = cache.derive_key(data_key, 'get_duplicate_info')
+
+            def detect(job):
+                info = DataQualityChecker(data).get_duplicate_info()
+                rows = cache.share_dataset(cache.derive_key(detection_key, 'duplicate_rows'), info['duplicate_rows'])
+                return {**info, 'duplicate_rows': rows}
+
+            job = widgets.submit_job("Duplicate detection", detection_key, detect)
+            st.session_state['duplicate_detection'] = {'job': job.key, 'data_key': data_key}
+
+        detection = st.session_state.get('duplicate_detection')
+        if detection is not None and detection['data_key'] == st.session_state.get('data_key'):
+            duplicate_info = widgets.job_result(detection, "Duplicate detection")
             
-            if duplicate_info['total_duplicates'] > 0:
+            if duplicate_info is not None and duplicate_info['total_duplicates'] > 0:
                 st.markdown(f"Found {duplicate_info['total_duplicates']} duplicate rows")
                 st.dataframe(duplicate_info['duplicate_rows'], use_container_width=True)
                 
                 if st.button("Remove Duplicates", type="secondary"):
-                    cleaned_data = checker.remove_duplicates(
-                        subset=cols_for_duplicate if cols_for_duplicate else None,
-                        keep=keep_option
+                    subset = cols_for_duplicate if cols_for_duplicate else None
+                    submit_cleaning_job(
+                        'duplicate_removal',
+                        "Duplicate removal",
+                        ('remove_duplicates', cols_for_duplicate, keep_option),
+                        lambda job: run_checker(
+                            data, lambda checker: checker.remove_duplicates(subset=subset, keep=keep_option)
+                        )
                     )
-                    st.session_state['data'] = cleaned_data
-                    st.success(f"Removed {duplicate_info['total_duplicates']} duplicate rows")
+                
+                cleaned_data = apply_cleaning_job('duplicate_removal', "Duplicate removal")
+                if cleaned_data is not None:
+                    st.success(f"Removed {len(data) - len(cleaned_data)} duplicate rows")
                     st.dataframe(cleaned_data.head(), use_container_width=True)
-            else:
+            elif duplicate_info is not None:
                 st.success("No duplicates found!")
     
     with tab_missing:
         st.markdown("### Missing Value Analysis")
         
-        missing_info = checker.get_missing_info()
+        missing_info = checker.get_missing_info(
+            stats.statistic(st.session_state.get('data_key'), checker.data, 'null_counts')
+        )
         if not missing_info.empty:
             st.markdown("#### Missing Value Statistics")
             st.dataframe(missing_info, use_container_width=True)
@@ -153,8 +177,18 @@ def main():
                 strategy_dict[column] = strategy
             
             if st.button("Apply Missing Value Handling", type="primary"):
-                cleaned_data = checker.handle_missing_values(strategy_dict)
-                st.session_state['data'] = cleaned_data
+                data = checker.data
+                submit_cleaning_job(
+                    'missing_value_handling',
+                    "Missing value handling",
+                    ('handle_missing_values', strategy_dict),
+                    lambda job: run_checker(
+                        data, lambda checker: checker.handle_missing_values(strategy_dict, job)
+                    )
+                )
+            
+            cleaned_data = apply_cleaning_job('missing_value_handling', "Missing value handling")
+            if cleaned_data is not None:
                 st.success("Successfully handled missing values!")
                 
                 col1, col2 = st.columns(2)
@@ -163,12 +197,49 @@ def main():
                     st.dataframe(missing_info, use_container_width=True)
                 with col2:
                     st.markdown("#### After Cleaning")
-                    new_missing_info = DataQualityChecker(cleaned_data).get_missing_info()
+                    new_missing_info = DataQualityChecker(cleaned_data).get_missing_info(
+                        stats.statistic(st.session_state.get('data_key'), cleaned_data, 'null_counts')
+                    )
                     st.dataframe(new_missing_info if not new_missing_info.empty 
                                else pd.DataFrame({"Message": ["No missing values!"]}),
                                use_container_width=True)
         else:
             st.success("No missing values found in the dataset!")
+    
+    with tab_pipeline:
+        st.markdown("### Recorded Pipeline")
+        
+        steps = recording.recorded_steps()
+        if not steps:
+            st.info("No cleaning steps applied yet. Every step you apply is recorded here.")
+            return
+        
+        st.json(steps)
+        st.download_button(
+            label="Download pipeline as JSON",
+            data=json.dumps({'steps': steps}, indent=2),
+            file_name='pipeline.json',
+            mime='application/json'
+        )
+        
+        if not pipeline.is_streamable(steps):
+            st.info("Some of these steps need the whole dataset, so the pipeline cannot be replayed "
+                    "here. Run it with `python -m insight_bench` instead.")
+            return
+        
+        st.markdown("#### Replay on New Data")
+        new_file = st.file_uploader("Upload a CSV file to clean with this pipeline", type="csv")
+        if new_file is not None:
+            widgets.export_download(
+                'replayed_data.csv',
+                key='replayed_data',
+                source_key=cache.derive_key(cache.content_hash(new_file.getvalue()), 'replay', steps),
+                label="Replay pipeline",
+                write=lambda path, compression, job: pipeline.stream(
+                    new_file, steps, path, compression, job=job
+                )
+            )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
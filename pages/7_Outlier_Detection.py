@@ -1,56 +1,24 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
+import pandas as pd
 
-st.set_page_config(page_title="Outlier Detection", page_icon="🔮", layout="wide")
-
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-def detect_outliers_zscore(data, column, threshold=3):
-    mean = np.mean(data[column])
-    std = np.std(data[column])
-    z_scores = (data[column] - mean) / std
-    return data[np.abs(z_scores) > threshold]
-
-def detect_outliers_iqr(data, column):
-    Q1 = data[column].quantile(0.25)
-    Q3 = data[column].quantile(0.75)
-    IQR = Q3 - Q1
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
-    return data[(data[column] < lower_bound) | (data[column] > upper_bound)]
+from insight_bench import cache, recording, sampling, stats, widgets
+from insight_bench.outliers import (
+    detect_outliers_iqr, detect_outliers_mad, detect_outliers_zscore, filter_range, outlier_bounds
+)
 
-def detect_outliers_mad(data, column, threshold=3.5):
-    median = np.median(data[column])
-    mad = np.median(np.abs(data[column] - median))
-    modified_zscore = 0.6745 * (data[column] - median) / mad
-    return data[np.abs(modified_zscore) > threshold]
+st.set_page_config(page_title="Outlier Detection", page_icon="🔮", layout="wide")
 
-def remove_outliers(data, column, method, threshold=3.5):
-    if method == "Z-score":
-        mean = np.mean(data[column])
-        std = np.std(data[column])
-        z_scores = (data[column] - mean) / std
-        return data[np.abs(z_scores) <= threshold]
-    elif method == "IQR":
-        Q1 = data[column].quantile(0.25)
-        Q3 = data[column].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        return data[(data[column] >= lower_bound) & (data[column] <= upper_bound)]
-    else:
-        median = np.median(data[column])
-        mad = np.median(np.abs(data[column] - median))
-        modified_zscore = 0.6745 * (data[column] - median) / mad
-        return data[np.abs(modified_zscore) <= threshold]
+widgets.apply_styles()
 
 def main():
     st.markdown("<h1 class='custom-sub'>Outlier Detection</h1>", unsafe_allow_html=True)
 
     if 'data' in st.session_state:
         data = st.session_state['data']
+        # Detection is read-only and may run on a preview sample; removal
+        # always applies the bounds to the full data.
+        view, view_key = widgets.preview_data('outliers')
         numeric_columns = data.select_dtypes(include=[np.number]).columns.tolist()
         
         if numeric_columns:
@@ -61,38 +29,74 @@ def main():
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("Detect Outliers"):
-                    if method == "Z-score":
-                        outliers = detect_outliers_zscore(data, selected_column)
-                    elif method == "IQR":
-                        outliers = detect_outliers_iqr(data, selected_column)
+                    st.session_state['outlier_detection'] = {
+                        'data_key': st.session_state.get('data_key'),
+                        'column': selected_column,
+                        'method': method
+                    }
+
+                detection = st.session_state.get('outlier_detection')
+                if (detection is not None and detection['data_key'] == st.session_state.get('data_key')
+                        and detection['column'] in numeric_columns):
+                    column = detection['column']
+                    if detection['method'] == "Z-score":
+                        outliers = detect_outliers_zscore(view, column)
+                    elif detection['method'] == "IQR":
+                        outliers = detect_outliers_iqr(view, column)
                     else:  # MAD
-                        outliers = detect_outliers_mad(data, selected_column)
+                        outliers = detect_outliers_mad(view, column)
                     
                     st.markdown("### Outliers")
+                    if len(view) < len(data):
+                        rate = pd.Series([len(outliers) / len(view)])
+                        lower, upper = sampling.proportion_interval(rate, len(view), len(data))
+                        st.caption(
+                            f"{len(outliers):,} outliers in the sample. Estimated in the full data: "
+                            f"{rate[0] * len(data):,.0f} (95% confidence: "
+                            f"{lower[0] * len(data):,.0f} to {upper[0] * len(data):,.0f})"
+                        )
                     st.dataframe(outliers)
                     
-                    csv = outliers.to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label="Download outliers data as CSV",
-                        data=csv,
-                        file_name='outliers_data.csv',
-                        mime='text/csv',
+                    widgets.csv_download(
+                        outliers,
+                        'outliers_data.csv',
+                        key='outliers_data',
+                        source_key=cache.derive_key(
+                            view_key, 'detect_outliers', column, detection['method']
+                        ),
+                        label="Download outliers data as CSV"
                     )
             
             with col2:
                 if st.button("Remove Outliers"):
-                    cleaned_data = remove_outliers(data, selected_column, method)
+                    lower, upper = outlier_bounds(data, selected_column, method)
+                    cleaned_data = filter_range(data, selected_column, lower, upper)
+                    parent_key = st.session_state.get('data_key')
+                    data_key = cache.derive_key(parent_key, 'remove_outliers', selected_column, method)
+                    stats.derive(parent_key, data_key, data, cleaned_data)
+                    cleaned_data = cache.share_dataset(data_key, cleaned_data)
                     st.session_state['data'] = cleaned_data
-                    
+                    st.session_state['data_key'] = data_key
+                    st.session_state['outlier_removal'] = data_key
+                    recording.record([{
+                        'op': 'filter_range',
+                        'column': selected_column,
+                        'lower': float(lower),
+                        'upper': float(upper)
+                    }])
+                
+                if ('outlier_removal' in st.session_state
+                        and st.session_state['outlier_removal'] == st.session_state.get('data_key')):
+                    cleaned_data = st.session_state['data']
                     st.markdown("### Cleaned Data")
                     st.dataframe(cleaned_data)
                     
-                    csv = cleaned_data.to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label="Download cleaned data as CSV",
-                        data=csv,
-                        file_name='cleaned_data.csv',
-                        mime='text/csv',
+                    widgets.csv_download(
+                        cleaned_data,
+                        'cleaned_data.csv',
+                        key='outliers_cleaned_data',
+                        source_key=st.session_state.get('data_key'),
+                        label="Download cleaned data as CSV"
                     )
         else:
             st.write("No numerical columns available for outlier detection.")
@@ -100,4 +104,5 @@ def main():
         st.write("No data available.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
@@ -1,17 +1,14 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-from sklearn.linear_model import Lasso
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import seaborn as sns
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
+
+from insight_bench import cache, sampling, widgets
+from insight_bench.features import (
+    get_correlation_importance, get_lasso_feature_importance, get_tree_feature_importance
+)
 
 st.set_page_config(page_title="Feature Selection", page_icon="⛏️", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
 
 def get_color_gradient(color1, color2, n_colors):
     """Calculate color gradient between two hex colors."""
@@ -19,47 +16,11 @@ def get_color_gradient(color1, color2, n_colors):
     color2 = np.array(tuple(int(color2.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))) / 255.0
     return [tuple(c) for c in np.linspace(color1, color2, n_colors)]
 
-def get_lasso_feature_importance(X, y, alpha=1.0):
-    """Calculate feature importance using Lasso regularization."""
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    
-    model = Lasso(alpha=alpha)
-    model.fit(X_scaled, y)
-    
-    importance = pd.DataFrame({
-        'Feature': X.columns,
-        'Importance': np.abs(model.coef_)
-    })
-    return importance.sort_values('Importance', ascending=False)
-
-def get_tree_feature_importance(X, y):
-    """Calculate feature importance using Random Forest."""
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X, y)
-    
-    importance = pd.DataFrame({
-        'Feature': X.columns,
-        'Importance': model.feature_importances_
-    })
-    return importance.sort_values('Importance', ascending=False)
-
-def get_correlation_importance(X, y, threshold=0.0):
-    """Calculate feature importance using absolute correlation with target."""
-    df = X.copy()
-    df['target'] = y
-    
-    # Calculate correlations with target
-    correlations = df.corr()['target'].drop('target')
-    
-    importance = pd.DataFrame({
-        'Feature': correlations.index,
-        'Importance': np.abs(correlations.values)
-    })
-    return importance.sort_values('Importance', ascending=False)
-
 def plot_feature_importance(importance_df, title):
     """Plot feature importance."""
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     ax = plt.gca()
     ax.set_facecolor('#0E1117')
@@ -90,6 +51,7 @@ def main():
         return
     
     data = st.session_state['data']
+    view, view_key = widgets.preview_data('features')
     
     numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
     
@@ -119,56 +81,99 @@ def main():
     n_features = st.slider("Number of features to select", 1, max_features, max_features)
     
     if st.button("Run Feature Selection"):
-        X = data[feature_cols]
-        y = data[target_variable]
+        X = view[feature_cols]
+        y = view[target_variable]
         
         if method == "Lasso":
-            importance_df = get_lasso_feature_importance(X, y, alpha)
+            artifact = f"importance:lasso:{target_variable}:{alpha}"
+            compute = lambda job: get_lasso_feature_importance(X, y, alpha)
         elif method == "Tree-based":
-            importance_df = get_tree_feature_importance(X, y)
+            artifact = f"importance:tree:{target_variable}"
+            compute = lambda job: get_tree_feature_importance(X, y, job)
         else: 
-            importance_df = get_correlation_importance(X, y, correlation_threshold)
+            artifact = f"importance:correlation:{target_variable}:{correlation_threshold}"
+            compute = lambda job: get_correlation_importance(X, y, correlation_threshold)
 
-        selected_features = importance_df.head(n_features)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.pyplot(plot_feature_importance(importance_df, f"Feature Importance using {method}"))
-        
-        with col2:
-            st.markdown("### Selected Features")
-            st.dataframe(selected_features)
-        
-        final_features = selected_features['Feature'].tolist() + [target_variable]
-        selected_data = data[final_features]
-        
-        st.session_state['selected_features'] = final_features
-        
-        csv = selected_data.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="Download dataset with selected features",
-            data=csv,
-            file_name='selected_features_dataset.csv',
-            mime='text/csv'
+        job = widgets.submit_job(
+            f"{method} feature selection",
+            cache.derive_key(view_key, artifact),
+            lambda job: cache.cached_artifact(view_key, artifact, lambda: compute(job)),
+            pool='fit'
         )
+        st.session_state['feature_selection'] = {
+            'job': job.key,
+            'data_key': st.session_state.get('data_key'),
+            'view_key': view_key,
+            'method': method,
+            'target': target_variable
+        }
 
-        st.markdown("### Correlation Heatmap of Selected Features")
-        hex_colors = ["#ffba49", "#fff", "#20a39e", "#fff","#ffba49"]
-        custom_cmap = LinearSegmentedColormap.from_list("CustomMap", hex_colors)
-        
-        fig, ax = plt.subplots(figsize=(12, 10))
-        if selected_data.shape[1] < 25:
-            sns.heatmap(selected_data.corr(), annot=True, fmt=".2f", cmap=custom_cmap, ax=ax)
-        else:
-            sns.heatmap(selected_data.corr(), annot=False, cmap="twilight", ax=ax)
-        ax.set_title("Correlation Matrix", color='white')
-        fig.patch.set_facecolor('#0E1117')
-        ax.set_facecolor('#0E1117')
-        ax.set_yticklabels(ax.get_yticklabels(), rotation=0, color="white")
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=90, color="white")
-        
-        st.pyplot(fig)
+    selection = st.session_state.get('feature_selection')
+    if (selection is None or selection['data_key'] != st.session_state.get('data_key')
+            or selection['view_key'] != view_key):
+        return
+    if selection['target'] not in numeric_cols:
+        return
+
+    method = selection['method']
+    target_variable = selection['target']
+    importance_df = widgets.job_result(selection, f"{method} feature selection")
+    if importance_df is None:
+        return
+
+    selected_features = importance_df.head(n_features)
+    if len(view) < len(data):
+        st.caption(f"Importances estimated from a sample of {len(view):,} rows.")
+        if method == "Correlation":
+            lower, upper = sampling.correlation_interval(selected_features['Importance'], len(view))
+            selected_features = selected_features.assign(**{
+                '95% Low': lower.clip(lower=0), '95% High': upper
+            })
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.pyplot(plot_feature_importance(importance_df, f"Feature Importance using {method}"))
+    
+    with col2:
+        st.markdown("### Selected Features")
+        st.dataframe(selected_features)
+    
+    final_features = selected_features['Feature'].tolist() + [target_variable]
+    selected_data = data[final_features]
+    
+    st.session_state['selected_features'] = final_features
+    
+    widgets.csv_download(
+        selected_data,
+        'selected_features_dataset.csv',
+        key='selected_features',
+        source_key=cache.derive_key(st.session_state.get('data_key'), 'select_features', final_features),
+        label="Download dataset with selected features"
+    )
+
+    st.markdown("### Correlation Heatmap of Selected Features")
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LinearSegmentedColormap
+
+    hex_colors = ["#ffba49", "#fff", "#20a39e", "#fff","#ffba49"]
+    custom_cmap = LinearSegmentedColormap.from_list("CustomMap", hex_colors)
+    
+    selected_view = view[final_features]
+    fig, ax = plt.subplots(figsize=(12, 10))
+    if selected_view.shape[1] < 25:
+        sns.heatmap(selected_view.corr(), annot=True, fmt=".2f", cmap=custom_cmap, ax=ax)
+    else:
+        sns.heatmap(selected_view.corr(), annot=False, cmap="twilight", ax=ax)
+    ax.set_title("Correlation Matrix", color='white')
+    fig.patch.set_facecolor('#0E1117')
+    ax.set_facecolor('#0E1117')
+    ax.set_yticklabels(ax.get_yticklabels(), rotation=0, color="white")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=90, color="white")
+    
+    st.pyplot(fig)
 
 if __name__ == "__main__":
     main()
+    widgets.diagnostics_panel()
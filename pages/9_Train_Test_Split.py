@@ -1,23 +1,13 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-import base64
-from io import BytesIO
+
+from insight_bench import cache, widgets
+from insight_bench.splitting import split_data
 
 st.set_page_config(page_title="Train Test Split", page_icon="➗", layout="wide")
 
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+widgets.apply_styles()
     
-def get_csv_download_link(df, filename):
-    """Generate a download link for a DataFrame"""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}.csv">Download {filename}</a>'
-    return href
-
 def main():
     st.markdown("<h1 class='custom-sub'>Train Test Split</h1>", unsafe_allow_html=True)
     
@@ -62,68 +52,50 @@ def main():
                     step=0.05,
                     help="Proportion of the dataset to include in the validation split"
                 )
+            else:
+                validation_size = None
  
+
         if st.button("Generate Split", type="primary"):
-            if include_validation:
-                train_val, test = train_test_split(
-                    data,
-                    test_size=test_size,
-                    random_state=random_state
-                )
-            
-                val_size_adjusted = validation_size / (1 - test_size)
-                train, val = train_test_split(
-                    train_val,
-                    test_size=val_size_adjusted,
-                    random_state=random_state
-                )
- 
-                st.markdown("### Split Results")
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Training Set Size", f"{len(train)} samples", 
-                             f"{len(train)/len(data):.1%} of data")
-                with col2:
-                    st.metric("Validation Set Size", f"{len(val)} samples",
-                             f"{len(val)/len(data):.1%} of data")
-                with col3:
-                    st.metric("Test Set Size", f"{len(test)} samples",
-                             f"{len(test)/len(data):.1%} of data")
-                
-                st.markdown("### Download Split Datasets")
-                dl_col1, dl_col2, dl_col3 = st.columns(3)
-                with dl_col1:
-                    st.markdown(get_csv_download_link(train, "train_set"), unsafe_allow_html=True)
-                with dl_col2:
-                    st.markdown(get_csv_download_link(val, "validation_set"), unsafe_allow_html=True)
-                with dl_col3:
-                    st.markdown(get_csv_download_link(test, "test_set"), unsafe_allow_html=True)
-                
-            else:
-                train, test = train_test_split(
-                    data,
-                    test_size=test_size,
-                    random_state=random_state
+            data_key = st.session_state.get('data_key')
+            split_key = cache.derive_key(data_key, 'train_test_split', test_size, random_state, validation_size)
+
+            def run_split(job):
+                return [
+                    (label, filename, cache.share_dataset(cache.derive_key(split_key, filename), subset))
+                    for label, filename, subset in split_data(data, test_size, random_state, validation_size, job)
+                ]
+
+            job = widgets.submit_job("Train test split", split_key, run_split)
+            st.session_state['split'] = {'job': job.key, 'data_key': data_key}
+
+        split = st.session_state.get('split')
+        if split is None or split['data_key'] != st.session_state.get('data_key'):
+            return
+        splits = widgets.job_result(split, "Train test split")
+        if splits is None:
+            return
+
+        st.markdown("### Split Results")
+        for col, (label, _, subset) in zip(st.columns(len(splits)), splits):
+            with col:
+                st.metric(f"{label} Size", f"{len(subset)} samples",
+                         f"{len(subset)/len(data):.1%} of data")
+        
+        st.markdown("### Download Split Datasets")
+        for dl_col, (_, filename, subset) in zip(st.columns(len(splits)), splits):
+            with dl_col:
+                widgets.csv_download(
+                    subset,
+                    f"{filename}.csv",
+                    key=filename,
+                    source_key=cache.derive_key(split['job'], filename),
+                    label=f"Download {filename}"
                 )
-                
-                st.markdown("### Split Results")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Training Set Size", f"{len(train)} samples",
-                             f"{len(train)/len(data):.1%} of data")
-                with col2:
-                    st.metric("Test Set Size", f"{len(test)} samples",
-                             f"{len(test)/len(data):.1%} of data")
-                
-                st.markdown("### Download Split Datasets")
-                dl_col1, dl_col2 = st.columns(2)
-                with dl_col1:
-                    st.markdown(get_csv_download_link(train, "train_set"), unsafe_allow_html=True)
-                with dl_col2:
-                    st.markdown(get_csv_download_link(test, "test_set"), unsafe_allow_html=True)
     
     else:
         st.write("No data available. Please upload a dataset first.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    widgets.diagnostics_panel()
\ No newline at end of file
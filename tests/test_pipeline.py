@@ -0,0 +1,57 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from insight_bench import pipeline
+
+CSV = "x,y,z\n1,a,\n2,b,\n3,c,u\n1.0,a,\n1.5,d,v\n,a,\n2,b,\n4,e,w\n,a,\n3,c,u\n"
+
+
+def _streamed(tmp_path, steps, csv, chunk_rows):
+    target = tmp_path / "out.csv"
+    pipeline.stream(io.BytesIO(csv.encode()), steps, str(target), chunk_rows=chunk_rows)
+    return target.read_text()
+
+
+def _in_memory(steps, csv):
+    [(_, df)] = pipeline.run(pd.read_csv(io.StringIO(csv)), steps)
+    return df.to_csv(index=False)
+
+
+@pytest.mark.parametrize("steps", [
+    [{"op": "remove_duplicates"}],
+    [{"op": "remove_duplicates", "subset": ["x", "y"]}],
+    [{"op": "forward_fill", "columns": ["x", "z"]}, {"op": "remove_duplicates"}],
+    [{"op": "drop_missing", "columns": ["x"]}, {"op": "fill_missing", "values": {"z": "none"}}],
+])
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 100])
+def test_stream_matches_run(tmp_path, steps, chunk_rows):
+    assert _streamed(tmp_path, steps, CSV, chunk_rows) == _in_memory(steps, CSV)
+
+
+def test_stream_removes_duplicates_across_chunks(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.integers(0, 20, 2_000), 'b': rng.choice(['x', 'y', 'z'], 2_000)})
+    csv = df.to_csv(index=False)
+    steps = [{"op": "remove_duplicates"}]
+    streamed = _streamed(tmp_path, steps, csv, 128)
+    assert streamed == _in_memory(steps, csv)
+    assert len(streamed.splitlines()) == 61
+
+
+def test_stream_reports_progress_from_bytes_read(tmp_path):
+    class Job:
+        reports = []
+
+        def check_cancelled(self):
+            pass
+
+        def report(self, progress, message=""):
+            self.reports.append(progress)
+
+    csv = pd.DataFrame({'a': range(5_000)}).to_csv(index=False)
+    pipeline.stream(io.BytesIO(csv.encode()), [], str(tmp_path / "out.csv"), chunk_rows=1_000, job=Job())
+    assert Job.reports == sorted(Job.reports)
+    assert Job.reports[-1] == 1.0
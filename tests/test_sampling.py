@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from insight_bench import sampling
+
+
+def test_proportion_interval_matches_wilson_reference():
+    # Wilson score interval for 15 successes out of 148, z = 1.96.
+    lower, upper = sampling.proportion_interval(pd.Series([15 / 148]), 148)
+    assert lower[0] == pytest.approx(0.0624, abs=1e-4)
+    assert upper[0] == pytest.approx(0.1605, abs=1e-4)
+
+
+def test_proportion_interval_does_not_collapse_at_the_edges():
+    lower, upper = sampling.proportion_interval(pd.Series([0.0, 1.0]), 50)
+    assert lower[0] == 0 and upper[0] == pytest.approx(1.96 ** 2 / (50 + 1.96 ** 2))
+    assert upper[1] == 1 and lower[1] == pytest.approx(50 / (50 + 1.96 ** 2))
+
+
+def test_proportion_interval_narrows_with_the_population():
+    proportions = pd.Series([0.2, 0.5])
+    lower, upper = sampling.proportion_interval(proportions, 1_000)
+    finite_lower, finite_upper = sampling.proportion_interval(proportions, 1_000, 2_000)
+    assert ((finite_upper - finite_lower) < (upper - lower)).all()
+    whole_lower, whole_upper = sampling.proportion_interval(proportions, 1_000, 1_000)
+    assert whole_lower.equals(proportions) and whole_upper.equals(proportions)
+
+
+def test_mean_interval():
+    values = pd.Series([1.0, 2.0, 3.0, 4.0, np.nan])
+    mean, half_width = sampling.mean_interval(values)
+    assert mean == 2.5
+    assert half_width == pytest.approx(1.96 * values.std() / 2)
+    assert sampling.mean_interval(values, 4)[1] == 0
+
+
+def test_correlation_interval_is_asymmetric():
+    lower, upper = sampling.correlation_interval(pd.Series([0.9]), 30)
+    assert lower[0] < 0.9 < upper[0] < 1
+    assert 0.9 - lower[0] > upper[0] - 0.9
+
+
+def test_stratified_sample_keeps_group_shares():
+    data = pd.DataFrame({'group': ['a'] * 900 + ['b'] * 90 + ['c'] * 10, 'value': range(1_000)})
+    sample = sampling.sample(data, 100, stratify='group')
+    assert sample['group'].value_counts().to_dict() == {'a': 90, 'b': 9, 'c': 1}
+    assert sample.index.is_monotonic_increasing
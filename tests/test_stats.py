@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from insight_bench import cache, stats
+from insight_bench.cleaning import DataQualityChecker
+from insight_bench.outliers import remove_outliers
+
+COLUMNS = ['a', 'b', 'c', 'k', 'f']
+SUMMABLE = ['a', 'b', 'c', 'f']
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    directory.mkdir(mode=0o700)
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(directory))
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    df = pd.DataFrame({
+        'a': rng.normal(1e6, 1, n),
+        'b': rng.normal(size=n),
+        'c': rng.integers(0, 5, n).astype(float),
+        'k': pd.Series(rng.choice(['x', 'y', 'z'], n), dtype=object),
+        'f': rng.random(n) < 0.3,
+    })
+    df.loc[rng.choice(n, 150, replace=False), 'b'] = np.nan
+    df.loc[rng.choice(n, 100, replace=False), 'k'] = None
+    duplicated = df.sample(100, random_state=0)
+    return pd.concat([df, duplicated], ignore_index=True)
+
+
+def _warm(data):
+    """Compute every statistic so each one is updated by ``derive``."""
+    computed = stats.DatasetStats(data)
+    computed.null_counts(data)
+    computed.corr(data)
+    for column in COLUMNS:
+        computed.counts(data, column)
+    for column in SUMMABLE:
+        computed.mean(data, column)
+        computed.minimum(data, column)
+        computed.maximum(data, column)
+    stats.save('parent', computed)
+
+
+def _assert_matches_full_scan(derived, after):
+    expected = stats.DatasetStats(after)
+    assert derived.rows == len(after)
+    pd.testing.assert_series_equal(derived.null_counts(after), expected.null_counts(after), check_dtype=False)
+    np.testing.assert_allclose(derived.corr(after).to_numpy(), after.select_dtypes(include=[np.number]).corr().to_numpy(), atol=1e-9)
+    for column in COLUMNS:
+        pd.testing.assert_series_equal(
+            derived.counts(after, column).sort_index(), expected.counts(after, column).sort_index(),
+            check_dtype=False, check_names=False
+        )
+        assert derived.nunique(after, column) == after[column].nunique()
+    for column in SUMMABLE:
+        assert derived.mean(after, column) == pytest.approx(after[column].mean())
+        assert derived.minimum(after, column) == after[column].min()
+        assert derived.maximum(after, column) == after[column].max()
+
+
+def _derive(before, after, removed=None, modified=None):
+    _warm(before)
+    stats.derive('parent', 'child', before, after, removed, modified)
+    derived = cache.load_artifact('child', stats.ARTIFACT)
+    assert derived is not None, "statistics were not updated"
+    _assert_matches_full_scan(derived, after)
+
+
+def test_derive_after_duplicate_removal(data):
+    checker = DataQualityChecker(data)
+    checker.remove_duplicates()
+    _derive(data, checker.data, checker.removed, checker.modified)
+
+
+def test_derive_after_dropping_missing_rows(data):
+    checker = DataQualityChecker(data)
+    checker.handle_missing_values({'b': 'Drop rows', 'k': 'Drop rows'})
+    _derive(data, checker.data, checker.removed, checker.modified)
+
+
+@pytest.mark.parametrize("strategy", ['Mean', 'Median', 'Mode', 'Forward fill'])
+def test_derive_after_filling_missing_values(data, strategy):
+    checker = DataQualityChecker(data)
+    checker.handle_missing_values({'b': strategy})
+    _derive(data, checker.data, checker.removed, checker.modified)
+
+
+@pytest.mark.parametrize("method", ['Z-score', 'IQR', 'MAD'])
+def test_derive_after_outlier_removal(data, method):
+    _derive(data, remove_outliers(data, 'a', method))
+
+
+def test_profile_of_boolean_column(data):
+    profile = stats.DatasetStats(data).profile(data, 'f')
+    assert profile['mean'] == pytest.approx(data['f'].mean())
+    assert (profile['min'], profile['max']) == (False, True)
+
+
+def test_statistic_treats_unreadable_artifacts_as_missing(data):
+    cache.store_artifact('parent', stats.ARTIFACT, "not statistics")
+    assert stats.statistic('parent', data, 'null_counts').equals(data.isnull().sum())
+    assert isinstance(cache.load_artifact('parent', stats.ARTIFACT), stats.DatasetStats)